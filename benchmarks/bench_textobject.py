@@ -0,0 +1,75 @@
+"""
+Benchmark of the TextObject reader against the former line-split implementation.
+
+Usage (with djsurfer installed or on PYTHONPATH):
+    python benchmarks/bench_textobject.py --rows 200000 --cols 20
+"""
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from djsurfer.lib_interface.text_object import TextObject
+
+#%%
+def read_split(path, delimiter=','):
+    """
+    The former TextObject.get_df: readlines() plus a Python split per line, all cells are strings.
+    """
+    with open(path, 'r') as f:
+        lines = f.readlines()
+
+    return pd.DataFrame([l.strip().split(delimiter) for l in lines[1:]],
+                        columns=lines[0].strip().split(delimiter))
+
+def timeit(func, repeat):
+
+    best = float('inf')
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        df = func()
+        best = min(best, time.perf_counter() - t0)
+
+    return best, df
+
+#%%
+def main():
+
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--rows', type=int, default=200000)
+    parser.add_argument('--cols', type=int, default=20)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / 'bench.txt'
+        columns = [f'col_{i}' for i in range(args.cols)]
+        pd.DataFrame(np.random.rand(args.rows, args.cols), columns=columns).to_csv(path, index=False)
+        print(f'{path.stat().st_size / 2**20:.1f} MiB, {args.rows} rows x {args.cols} columns')
+
+        readers = {
+            'split (former)': lambda: read_split(path),
+            'TextObject c': lambda: TextObject(path).get_df(),
+            'TextObject c float32': lambda: TextObject(path, dtypes='float32').get_df(),
+            'TextObject c usecols=1': lambda: TextObject(path, usecols=columns[:1]).get_df(),
+            'TextObject mmap': lambda: TextObject(path, engine='mmap').get_df(),
+            'TextObject mmap window': lambda: TextObject(path, engine='mmap').get_df(rows=slice(args.rows // 2, args.rows // 2 + 1000)),
+        }
+        try:
+            import pyarrow  # noqa: F401
+            readers['TextObject pyarrow'] = lambda: TextObject(path, engine='pyarrow').get_df()
+        except ImportError:
+            pass
+
+        for label, func in readers.items():
+            seconds, df = timeit(func, args.repeat)
+            mib = df.memory_usage(deep=True).sum() / 2**20
+            print(f'{label:<24} {seconds:8.3f} s {mib:10.1f} MiB')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,142 @@
+"""
+Synthetic data generators for the benchmarks, one per data source of djsurfer.
+
+Files that exist already are kept, so a data directory can be reused between runs.
+"""
+
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+#%%
+REPORT = """Test Results Report
+File Name:   {name}
+Report Date:  May 1, 2024    Time:  10:22:33
+Failures:   {failures}
+NTC1   10.00K   1.00K   {ntc1:.2f}K
+NTC2   10.00K   1.00K   {ntc2:.2f}K
+NTC3   10.00K   1.00K   {ntc3:.2f}K
+C1   100.00p   5.00p   {c1:.2f}pF
+C2   100.00p   5.00p   {c2:.2f}pF
+5-51_Op   100.00M   > 10 M   > 100 M
+6-52_Op   100.00M   > 10 M   > 100 M
+"""
+
+def write_text_pool(directory, n_files, rows, cols=10, seed=0):
+    """
+    Write CSV files for TextObject with a 'time' column and cols random signals.
+
+    Args:
+        directory (str): The directory to write to, created if it does not exist.
+        n_files (int): The number of files.
+        rows (int): The number of rows per file.
+        cols (int, optional): The number of signal columns. Defaults to 10.
+        seed (int, optional): The seed of the random values. Defaults to 0.
+
+    Returns:
+        list: The paths of the files.
+    """
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    rng = np.random.default_rng(seed)
+
+    paths = []
+    for i in range(n_files):
+        path = directory / f'data{i:06d}.txt'
+        if not path.is_file():
+            df = pd.DataFrame(np.round(rng.random((rows, cols)) * 200, 4), columns=[f'col_{j}' for j in range(cols)])
+            df.insert(0, 'time', np.arange(rows) * 0.001)
+            df.to_csv(path, index=False)
+        paths.append(path)
+
+    return paths
+
+def write_meas_dir(directory, n_files, points, z_per_dir=10, seed=0):
+    """
+    Write cylinder point clouds for MeasTextObject_SY, grouped into run directories.
+
+    Args:
+        directory (str): The measure root directory, created if it does not exist.
+        n_files (int): The number of profiles.
+        points (int): The number of points per profile.
+        z_per_dir (int, optional): The number of Z levels per run directory. Defaults to 10.
+        seed (int, optional): The seed of the noise on the radius. Defaults to 0.
+
+    Returns:
+        list: The paths of the files.
+    """
+    directory = Path(directory)
+    rng = np.random.default_rng(seed)
+    angle = np.deg2rad(np.arange(points) * 380 / points)
+
+    paths = []
+    for i in range(n_files):
+        run = directory / f'run{i // z_per_dir:05d}'
+        run.mkdir(parents=True, exist_ok=True)
+        z = 60 + i % z_per_dir
+        path = run / f'Kr_44H7FR_Z{z}.txt'
+        if not path.is_file():
+            radius = 22.0 + rng.normal(0, 0.002, points)
+            xyz = np.column_stack([radius * np.cos(angle), radius * np.sin(angle), np.full(points, -float(z))])
+            np.savetxt(path, xyz, fmt='%.5f', delimiter=' ')
+        paths.append(path)
+
+    return paths
+
+def write_reports(directory, n_files, seed=0):
+    """
+    Write single-unit ICT text reports for TextReportObject.
+
+    Args:
+        directory (str): The directory to write to, created if it does not exist.
+        n_files (int): The number of reports.
+        seed (int, optional): The seed of the measured values. Defaults to 0.
+
+    Returns:
+        list: The paths of the files.
+    """
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    rng = np.random.default_rng(seed)
+
+    paths = []
+    for i in range(n_files):
+        path = directory / f'unit_split_{i + 1}.txt'
+        if not path.is_file():
+            path.write_text(_report(i, rng))
+        paths.append(path)
+
+    return paths
+
+def write_unit_log(path, n_units, seed=0):
+    """
+    Write a multi-unit ICT log with n_units reports separated by ' ===' rows.
+
+    Args:
+        path (str): The file to write.
+        n_units (int): The number of units.
+        seed (int, optional): The seed of the measured values. Defaults to 0.
+
+    Returns:
+        pathlib.Path: The path of the file.
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    if not path.is_file():
+        rng = np.random.default_rng(seed)
+        with open(path, 'w') as f:
+            f.write('ICT log\n')
+            for i in range(n_units):
+                f.write(_report(i, rng))
+                f.write(' ' + '=' * 40 + '\n')
+
+    return path
+
+def _report(i, rng):
+
+    ntc = 10 + rng.normal(0, 0.1, 3)
+    c = 100 + rng.normal(0, 1, 2)
+
+    return REPORT.format(name=f'217312-{i:06d}_CELL', failures=int(rng.integers(0, 3)),
+                         ntc1=ntc[0], ntc2=ntc[1], ntc3=ntc[2], c1=c[0], c2=c[1])
@@ -0,0 +1,183 @@
+"""
+Benchmark suite of the djsurfer interfaces and DataPool operations.
+
+Every case is timed (best of --repeat runs) and profiled for the peak memory allocated
+while it runs (tracemalloc, in a separate run). The results are written as JSON so that
+they can be compared between releases.
+
+Usage (with djsurfer installed or on PYTHONPATH):
+    python benchmarks/run_suite.py --scale small --output results.json
+    python benchmarks/run_suite.py --scale small --compare baseline.json
+    python benchmarks/run_suite.py --files 100000 --rows 100 --data-dir /data/bench --case datapool
+"""
+
+import argparse
+import gc
+import json
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+import djsurfer
+from djsurfer.datainterface import DataInterface
+from djsurfer.datapool import DataPool
+from djsurfer.lib_interface.text_object import TextObject
+from djsurfer.lib_interface.meas_object_SY import MeasTextObject_SY, MeasObject_SY
+from djsurfer.lib_interface.get_data_textreport import TextReportObject
+from djsurfer.lib_interface.unit_splitt_from_textobject import write_unit_table
+
+from generators import write_text_pool, write_meas_dir, write_reports, write_unit_log
+
+#%%
+# (number of files, rows per file), the CSV files have 11 columns of about 10 bytes
+SCALES = {
+    'tiny': (10, 1000),
+    'small': (100, 10000),
+    'medium': (1000, 100000),
+    'many': (100000, 100),
+    'large': (10, 10000000),
+}
+
+def measure(func, repeat):
+    """
+    Returns the best wall time of repeat runs and the peak traced memory of one more run in bytes.
+    """
+    best = float('inf')
+    for _ in range(repeat):
+        DataInterface.cache.clear()
+        gc.collect()
+        t0 = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - t0)
+
+    DataInterface.cache.clear()
+    gc.collect()
+    tracemalloc.start()
+    try:
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return best, peak
+
+def dir_size(paths):
+
+    return sum(Path(p).stat().st_size for p in paths)
+
+#%%
+def cases(data_dir, n_files, rows, selected):
+    """
+    Generate the data and yield (name, function, input bytes) for each selected benchmark case.
+
+    The data of a group of cases is only generated if one of its cases is selected.
+    """
+    def group(*names):
+        return any(selected(name) for name in names)
+
+    if group('textobject', 'datapool'):
+        text_files = write_text_pool(data_dir / f'text_{n_files}x{rows}', n_files, rows)
+        text_dir = text_files[0].parent
+        first = text_files[0]
+
+        yield 'textobject.get_df', lambda: TextObject(first).get_df(), dir_size([first])
+        yield 'textobject.get_df[float32]', lambda: TextObject(first, dtypes='float32').get_df(), dir_size([first])
+        yield 'textobject.get_df[mmap]', lambda: TextObject(first, engine='mmap').get_df(), dir_size([first])
+        yield 'datapool.init', lambda: DataPool(text_dir, interface=TextObject), 0
+        yield 'datapool.get_signal', lambda: DataPool(text_dir, interface=TextObject, cache_bytes=0).get_signal('col_0'), dir_size(text_files)
+        yield 'datapool.summarize', lambda: DataPool(text_dir, interface=TextObject, lazy=True).summarize(['col_0']), dir_size(text_files)
+
+    if group('meastextobject', 'measobject'):
+        meas_files = write_meas_dir(data_dir / f'meas_{n_files}x{rows}', n_files, rows)
+        meas_dir = meas_files[0].parent.parent
+        yield 'meastextobject.get_df', lambda: MeasTextObject_SY(meas_files[0]).get_df(), dir_size(meas_files[:1])
+        yield 'measobject.get_df', lambda: MeasObject_SY(meas_dir, config={}).get_df(), dir_size(meas_files)
+
+    if group('textreport'):
+        report_files = write_reports(data_dir / f'reports_{n_files}', n_files)
+        yield 'textreport.to_table', lambda: DataPool(report_files[0].parent, interface=TextReportObject).to_table(), dir_size(report_files)
+
+    if group('unitlog'):
+        log = write_unit_log(data_dir / f'units_{n_files}' / 'log.txt', n_files)
+        table = log.with_name('table.csv')
+        yield 'unitlog.write_unit_table', lambda: write_unit_table(log, table), dir_size([log])
+
+def compare(results, baseline, threshold):
+    """
+    Print the time ratio of each case against a baseline result file.
+
+    Returns:
+        bool: True if no case is slower than threshold times the baseline.
+    """
+    with open(baseline, 'r') as f:
+        old = {(r['case'], r['files'], r['rows']): r for r in json.load(f)['results']}
+
+    ok = True
+    print(f'\n{"case":<30} {"ratio":>8}')
+    for r in results:
+        ref = old.get((r['case'], r['files'], r['rows']))
+        if ref is None or ref['seconds'] == 0:
+            continue
+        ratio = r['seconds'] / ref['seconds']
+        flag = ''
+        if ratio > threshold:
+            flag, ok = '  REGRESSION', False
+        print(f'{r["case"]:<30} {ratio:8.2f}{flag}')
+
+    return ok
+
+#%%
+def main():
+
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--scale', choices=list(SCALES), default='tiny')
+    parser.add_argument('--files', type=int, help='number of files, overrides the scale')
+    parser.add_argument('--rows', type=int, help='rows (points) per file, overrides the scale')
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--case', action='append', help='run only cases starting with this name, can be repeated')
+    parser.add_argument('--data-dir', help='directory to generate the data in and reuse it, defaults to a temporary one')
+    parser.add_argument('--output', default='bench_results.json')
+    parser.add_argument('--compare', help='a former result file to compare with')
+    parser.add_argument('--threshold', type=float, default=1.2, help='time ratio reported as regression')
+    args = parser.parse_args()
+
+    n_files, rows = SCALES[args.scale]
+    n_files = args.files or n_files
+    rows = args.rows or rows
+
+    with tempfile.TemporaryDirectory() as tmp:
+        data_dir = Path(args.data_dir or tmp)
+
+        results = []
+        print(f'{"case":<30} {"seconds":>10} {"peak MiB":>10} {"input MiB":>10}')
+        def selected(name):
+            return not args.case or any(name.startswith(c) for c in args.case)
+
+        for name, func, nbytes in cases(data_dir, n_files, rows, selected):
+            if not selected(name):
+                continue
+            seconds, peak = measure(func, args.repeat)
+            results.append({'case': name, 'files': n_files, 'rows': rows, 'seconds': seconds,
+                            'peak_bytes': peak, 'input_bytes': nbytes})
+            print(f'{name:<30} {seconds:10.4f} {peak / 2**20:10.1f} {nbytes / 2**20:10.1f}')
+
+    meta = {'djsurfer': djsurfer.__version__, 'python': sys.version.split()[0], 'pandas': pd.__version__,
+            'numpy': np.__version__, 'platform': platform.platform(), 'repeat': args.repeat,
+            'date': datetime.now(timezone.utc).isoformat(timespec='seconds')}
+    with open(args.output, 'w') as f:
+        json.dump({'meta': meta, 'results': results}, f, indent=2)
+    print(f'\nResults written to {args.output}')
+
+    if args.compare and not compare(results, args.compare, args.threshold):
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,291 @@
+from collections import OrderedDict
+from threading import RLock, get_ident
+from pathlib import Path
+import hashlib
+import os
+
+#%%
+def frame_nbytes(df):
+    """
+    Estimate the memory footprint of a dataframe in bytes.
+
+    Args:
+        df (pandas.DataFrame): The dataframe to measure.
+
+    Returns:
+        int: The deep memory usage of the dataframe including its index.
+    """
+    return int(df.memory_usage(index=True, deep=True).sum())
+
+#%%
+class FrameCache(object):
+    """
+    A pool-wide in-memory LRU cache for parsed dataframes.
+
+    Entries are keyed by the source file identity (path, mtime, size) so that
+    a changed file is never served from a stale entry. When the total size of
+    cached frames exceeds the memory budget, the least recently used frames
+    are evicted.
+
+    Args:
+        max_bytes (int, optional): The memory budget in bytes. None means unlimited. Defaults to 1 GiB.
+    """
+
+    def __init__(self, max_bytes=2**30):
+
+        self.max_bytes = max_bytes
+        self.nbytes = 0
+        self._entries = OrderedDict()
+        self._lock = RLock()
+
+    def __len__(self):
+
+        return len(self._entries)
+
+    def __contains__(self, key):
+
+        return key in self._entries
+
+    def get(self, key):
+        """
+        Return the cached dataframe for the key and mark it as recently used.
+
+        Args:
+            key (tuple): The cache key.
+
+        Returns:
+            pandas.DataFrame: The cached dataframe, or None if the key is not cached.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            self._entries.move_to_end(key)
+            return entry[0]
+
+    def put(self, key, df):
+        """
+        Store a dataframe in the cache and evict old entries over budget.
+
+        Frames larger than the whole budget are not cached at all.
+
+        Args:
+            key (tuple): The cache key.
+            df (pandas.DataFrame): The dataframe to cache.
+        """
+        nbytes = frame_nbytes(df)
+        with self._lock:
+            self.pop(key)
+            if self.max_bytes is not None and nbytes > self.max_bytes:
+                return
+            self._entries[key] = (df, nbytes)
+            self.nbytes += nbytes
+            self._evict()
+
+    def pop(self, key):
+        """
+        Remove a single entry from the cache.
+
+        Args:
+            key (tuple): The cache key.
+
+        Returns:
+            pandas.DataFrame: The removed dataframe, or None if the key was not cached.
+        """
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry is None:
+                return None
+            self.nbytes -= entry[1]
+            return entry[0]
+
+    def discard(self, prefix):
+        """
+        Remove all entries whose key starts with the given prefix.
+
+        Args:
+            prefix (tuple): The leading elements of the keys to remove.
+        """
+        n = len(prefix)
+        with self._lock:
+            for key in [k for k in self._entries if k[:n] == prefix]:
+                self.pop(key)
+
+    def clear(self):
+        """
+        Remove all entries from the cache.
+        """
+        with self._lock:
+            self._entries.clear()
+            self.nbytes = 0
+
+    def resize(self, max_bytes):
+        """
+        Change the memory budget and evict entries if necessary.
+
+        Args:
+            max_bytes (int): The new memory budget in bytes. None means unlimited.
+        """
+        with self._lock:
+            self.max_bytes = max_bytes
+            self._evict()
+
+    def _evict(self):
+
+        if self.max_bytes is None:
+            return
+        while self.nbytes > self.max_bytes and self._entries:
+            _, (_, nbytes) = self._entries.popitem(last=False)
+            self.nbytes -= nbytes
+
+#%%
+class DiskCache(object):
+    """
+    An opt-in on-disk cache storing parsed dataframes as columnar files.
+
+    Each source is stored in one file named after a hash of the interface, path and
+    parameters plus a hash of the mtime and size of the source. A changed source
+    therefore misses the cache, and the outdated file is replaced on the next write.
+    Feather files are memory-mapped on read. Requires the optional package pyarrow.
+
+    Args:
+        directory (str): The cache directory, created if it does not exist.
+        fmt (str, optional): The file format, 'feather' or 'parquet'. Defaults to 'feather'.
+    """
+
+    def __init__(self, directory, fmt='feather'):
+
+        if fmt not in ('feather', 'parquet'):
+            raise ValueError(f"Unknown cache format '{fmt}', expected 'feather' or 'parquet'.")
+
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.fmt = fmt
+
+    def __repr__(self):
+
+        return f'{self.__class__.__name__}("{self.directory}", fmt="{self.fmt}")'
+
+    @staticmethod
+    def _hash(items):
+
+        return hashlib.sha1(repr(items).encode('utf-8')).hexdigest()[:16]
+
+    def filepath(self, key):
+        """
+        Returns the cache file path for a key.
+
+        Args:
+            key (tuple): The cache key (interface, path, parameters, mtime, size).
+
+        Returns:
+            pathlib.Path: The path of the cache file.
+        """
+        return self.directory / f'{self._hash(key[:-2])}_{self._hash(key[-2:])}.{self.fmt}'
+
+    def get(self, key, columns=None):
+        """
+        Read the cached dataframe for the key.
+
+        Args:
+            key (tuple): The cache key.
+            columns (list, optional): Read only these columns. Defaults to None.
+
+        Returns:
+            pandas.DataFrame: The cached dataframe, or None if there is no valid cache file or it
+                              does not hold all requested columns.
+        """
+        path = self.filepath(key)
+        if not path.is_file():
+            return None
+
+        try:
+            if self.fmt == 'feather':
+                from pyarrow import feather
+                table = feather.read_table(path, memory_map=True)
+            else:
+                from pyarrow import parquet
+                table = parquet.read_table(path, memory_map=True)
+        except (OSError, ValueError):
+            # incomplete or corrupt cache file, parse the source again
+            return None
+
+        metadata = table.schema.pandas_metadata or {}
+        if columns is not None and len(metadata.get('column_indexes', [])) > 1:
+            # MultiIndex columns are stored under stringified tuples, select on the innermost level
+            # after reading like DataInterface.select_columns does
+            df = table.to_pandas()
+            if not set(columns) <= set(df.columns.get_level_values(-1)):
+                return None
+            return df.loc[:, df.columns.get_level_values(-1).isin(columns)]
+
+        if columns is not None:
+            if not set(columns) <= set(table.column_names):
+                # the stored frame does not hold the selection, the source is read with it
+                return None
+            # keep the stored index columns so that the index is restored
+            index_columns = metadata.get('index_columns', [])
+            names = [c for c in columns if c in table.column_names]
+            names += [c for c in index_columns if isinstance(c, str) and c not in names]
+            table = table.select(names)
+
+        return table.to_pandas()
+
+    def put(self, key, df):
+        """
+        Write a dataframe to the cache and remove outdated files of the same source.
+
+        Args:
+            key (tuple): The cache key.
+            df (pandas.DataFrame): The dataframe to store.
+
+        Returns:
+            bool: True if the dataframe was written.
+        """
+        import pyarrow as pa
+
+        path = self.filepath(key)
+        try:
+            table = pa.Table.from_pandas(df)
+        except (pa.ArrowException, TypeError, ValueError):
+            # columns of mixed python objects cannot be stored, the source is parsed next time
+            return False
+
+        # write to a temporary file first so that readers never see a partial file
+        tmp = path.with_name(f'{path.name}.{os.getpid()}-{get_ident()}.tmp')
+        if self.fmt == 'feather':
+            from pyarrow import feather
+            # uncompressed so that reads are zero-copy from the memory map
+            feather.write_feather(table, tmp, compression='uncompressed')
+        else:
+            from pyarrow import parquet
+            parquet.write_table(table, tmp)
+        os.replace(tmp, path)
+
+        for old in self.directory.glob(f'{self._hash(key[:-2])}_*.{self.fmt}'):
+            if old != path:
+                try:
+                    old.unlink()
+                except FileNotFoundError:
+                    pass
+
+        return True
+
+    def pop(self, key):
+        """
+        Remove the cache file of a key.
+
+        Args:
+            key (tuple): The cache key.
+        """
+        try:
+            self.filepath(key).unlink()
+        except FileNotFoundError:
+            pass
+
+    def clear(self):
+        """
+        Remove all cache files from the directory.
+        """
+        for path in self.directory.glob(f'*.{self.fmt}'):
+            path.unlink()
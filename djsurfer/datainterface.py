@@ -1,13 +1,30 @@
-
 from abc import ABC, abstractmethod
 from pathlib import Path
+import os
+import stat
+
+from djsurfer.cache import FrameCache
+from djsurfer.profiling import span
+from djsurfer.dtypes import apply_dtype_policy
 
 #%%
 class DataInterface(ABC):
     """
     Abstract base class for data interfaces.
+
+    Parsed dataframes are kept in a shared LRU cache keyed on the path, mtime
+    and size of the source file, so repeated access to ``dataframe`` parses
+    the file only once until it changes on disk. If ``disk_cache`` is set, the
+    parsed result is also persisted and reused across sessions.
     """
 
+    # Default cache shared by all interface objects; a DataPool may assign its own.
+    cache = FrameCache()
+    # Optional on-disk cache (DiskCache), disabled by default.
+    disk_cache = None
+    # Optional compact dtype policy applied to parsed dataframes, see djsurfer.dtypes.
+    dtype_policy = None
+
     def __init__(self, path, name=None, comment=None, config=None):
         """
         Initializes a DataInterface object.
@@ -22,35 +39,291 @@ class DataInterface(ABC):
         self.__name = name
         self.comment = comment
         self.config = config
+        self._cache_key = None
+
+
+    def __getstate__(self):
+
+        # The cache holds a lock and is local to the process; it is not pickled.
+        state = self.__dict__.copy()
+        state.pop('cache', None)
+
+        return state
 
-        
     @property
     def name(self):
-        
+
         if self.__name is None:
             self.__name = self.path.stem
-        
+
         return self.__name
 
     @property
     def dataframe(self):
         """
         Returns the dataframe associated with the data interface.
-        
+
+        The dataframe is served from the cache if the source file is unchanged.
+
         Returns:
             pandas.DataFrame: The dataframe associated with the data interface.
         """
-        return self.get_df()
-    
+        return self.load()
+
     df = dataframe
 
+    def load(self, columns=None):
+        """
+        Returns the cached dataframe, optionally restricted to some columns.
+
+        A column selection is served from a cached full dataframe if that holds all
+        requested columns, otherwise it is pushed down to the backend so that only
+        the requested columns are read from the source.
+
+        Args:
+            columns (list, optional): The columns (signals) to return. Missing columns are skipped.
+                                      Defaults to None, which returns all columns.
+
+        Returns:
+            pandas.DataFrame: The (selected) data as a pandas DataFrame.
+        """
+        key = self.cache_key()
+        if key is None:
+            return self._parse(columns)
+
+        df = self.cached(key, columns)
+        if df is None:
+            df = self._fetch(key, columns)
+            self.store(df, key, columns)
+
+        return df
+
+    def cached(self, key, columns=None):
+        """
+        Returns the cached dataframe for a key without reading the source.
+
+        Args:
+            key (tuple): The cache key as returned by ``cache_key``.
+            columns (list, optional): The column selection. Defaults to None.
+
+        Returns:
+            pandas.DataFrame: The cached (selected) dataframe, or None if it is not cached.
+        """
+        if key is None:
+            return None
+
+        df = self.cache.get(key)
+        if df is not None and self.has_columns(df, columns):
+            return self.select_columns(df, columns)
+        if columns is not None:
+            return self.cache.get(key + (tuple(columns),))
+
+        return None
+
+    @staticmethod
+    def has_columns(df, columns):
+        """
+        Check whether a dataframe holds all given columns, e.g. whether a cached full dataframe can
+        serve a selection. The full dataframe of some backends holds only a default set of signals.
+
+        Args:
+            df (pandas.DataFrame): The dataframe.
+            columns (list): The column names, matched against the innermost level for MultiIndex columns.
+
+        Returns:
+            bool: True if every column is present or columns is None.
+        """
+        if columns is None:
+            return True
+
+        return set(columns) <= set(df.columns.get_level_values(-1))
+
+    @staticmethod
+    def select_columns(df, columns):
+        """
+        Select the given columns of a dataframe, skipping those that do not exist.
+
+        For MultiIndex columns the names are matched against the innermost level.
+
+        Args:
+            df (pandas.DataFrame): The dataframe.
+            columns (list): The column names to keep.
+
+        Returns:
+            pandas.DataFrame: The dataframe with the selected columns.
+        """
+        if columns is None:
+            return df
+        if df.columns.nlevels > 1:
+            return df.loc[:, df.columns.get_level_values(-1).isin(columns)]
+
+        return df[[c for c in columns if c in df.columns]]
+
+    def _fetch(self, key, columns=None):
+        """
+        Read the dataframe from the disk cache if possible, else parse the source and fill the disk cache.
+        """
+        if self.disk_cache is None or key is None:
+            return self._parse(columns)
+
+        with span('disk_cache', self.name, path=self.disk_cache.filepath(key)) as info:
+            df = info['frame'] = self.disk_cache.get(key, columns=columns)
+        if df is None:
+            df = self._parse(columns)
+            if columns is None:
+                self.disk_cache.put(key, df)
+
+        return df
+
+    def _parse(self, columns=None):
+        """
+        Parse the source with ``get_df``, reported as stage 'parse' to the profiling hooks.
+        """
+        with span('parse', self.name, path=self.path) as info:
+            df = info['frame'] = self.apply_dtype_policy(self.get_df(columns=columns))
+
+        return df
+
+    def cache_params(self):
+        """
+        Returns the interface parameters that influence the parsed result.
+
+        Subclasses override this to add e.g. the delimiter, so objects reading the
+        same file with different settings do not share a cache entry.
+
+        Returns:
+            tuple: Hashable parameters, empty by default.
+        """
+        return ()
+
+    def cache_key(self):
+        """
+        Returns the cache key of the current state of the source file.
+
+        Returns:
+            tuple: (interface, path, parameters, mtime, size), or None if the path is not a regular file.
+        """
+        try:
+            st = os.stat(self.path)
+        except OSError:
+            return None
+        if not stat.S_ISREG(st.st_mode):
+            return None
+
+        return self._key_prefix() + (st.st_mtime_ns, st.st_size)
+
+    def _key_prefix(self):
+        """
+        Returns the part of the cache key that does not depend on the file version: (interface, path, parameters).
+        """
+        params = self.cache_params()
+        if self.dtype_policy is not None:
+            params = params + (('dtype_policy', repr(self.dtype_policy)),)
+
+        return (self.__class__.__name__, str(self.path), params)
+
+    def apply_dtype_policy(self, df):
+        """
+        Convert a parsed dataframe according to ``dtype_policy``.
+
+        Args:
+            df (pandas.DataFrame): The parsed dataframe.
+
+        Returns:
+            pandas.DataFrame: The dataframe with compact dtypes, unchanged if there is no policy.
+        """
+        return apply_dtype_policy(df, self.dtype_policy)
+
+    def store(self, df, key=None, columns=None):
+        """
+        Put a parsed dataframe into the cache, replacing an outdated entry of this object.
+
+        Args:
+            df (pandas.DataFrame): The parsed dataframe.
+            key (tuple, optional): The cache key. Defaults to the current key of the source file.
+            columns (list, optional): The column selection the dataframe was read with. Defaults to None.
+        """
+        key = self.cache_key() if key is None else key
+        if key is None:
+            return
+        if columns is not None:
+            self.cache.put(key + (tuple(columns),), df)
+            return
+        if self._cache_key is not None and self._cache_key != key:
+            self.cache.pop(self._cache_key)
+        self._cache_key = key
+        self.cache.put(key, df)
+
+    def iter_chunks(self, chunksize=100000, columns=None):
+        """
+        Iterate over the data in chunks of rows.
+
+        Backends that can read their source incrementally override this so that the peak
+        memory is bounded by the chunk size. This default reads the whole dataframe once
+        and slices it.
+
+        Args:
+            chunksize (int, optional): The number of rows per chunk. Defaults to 100000.
+            columns (list, optional): Read only these columns (signals). Defaults to None.
+
+        Yields:
+            pandas.DataFrame: The consecutive chunks of the data.
+        """
+        df = self.apply_dtype_policy(self.get_df(columns=columns))
+        for start in range(0, len(df), chunksize):
+            yield df.iloc[start:start + chunksize]
+
+    def get_record(self, columns=None):
+        """
+        Returns the data of a single-row source as a dict, e.g. the fields of a report.
+
+        Backends that extract one record per file override this to skip building a dataframe.
+
+        Args:
+            columns (list, optional): The fields to return. Defaults to None, which returns all fields.
+
+        Returns:
+            dict: {column: value}
+        """
+        df = self.load(columns=columns)
+        if len(df) != 1:
+            raise ValueError(f'{self.path} holds {len(df)} rows, a record needs exactly one.')
+
+        return df.iloc[0].to_dict()
+
+    def invalidate(self):
+        """
+        Drop the cached dataframe of this object from memory and from the disk cache.
+        """
+        # drops the full dataframe and all column selections of any file version
+        self.cache.discard(self._key_prefix())
+        if self.disk_cache is not None:
+            for key in (self._cache_key, self.cache_key()):
+                if key is not None:
+                    self.disk_cache.pop(key)
+        self._cache_key = None
+
+    def refresh(self):
+        """
+        Re-read the source and return the fresh dataframe.
+
+        Returns:
+            pandas.DataFrame: The re-parsed dataframe.
+        """
+        self.invalidate()
+
+        return self.dataframe
+
     @abstractmethod
-    def get_df(self):
-        
+    def get_df(self, columns=None):
+
         """
         Abstract method to get the data as a pandas DataFrame.
 
+        Parameters:
+        - columns (list, optional): The columns (signals) to read. Backends should read
+          only these from the source where possible. Defaults to None, which reads all columns.
+
         Returns:
         - df (pandas.DataFrame): The data as a pandas DataFrame.
         """
-
@@ -1,9 +1,54 @@
 
+import re
+import asyncio
 import pandas as pd
 import numpy as np
-from pathlib import Path
-import re
-import os
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+
+from djsurfer.cache import FrameCache, DiskCache, frame_nbytes
+from djsurfer.datainterface import DataInterface
+from djsurfer.discovery import scan_files, FileIndex
+from djsurfer.resample import make_grid, resample
+from djsurfer.stats import RunningStats, StatsIndex, STATS
+from djsurfer.profiling import span, traced
+from djsurfer.registry import Registry
+from djsurfer.dtypes import apply_dtype_policy, dtype_rules
+
+#%%
+def _read_df(obj, key, columns=None):
+    """
+    Parse a single interface object. Defined on module level so it can be sent to worker processes.
+    """
+    return obj._fetch(key, columns)
+
+def _read_frame(obj, columns=None):
+    """
+    Stat and read a single interface object without putting it into the memory cache.
+    """
+    key = obj.cache_key()
+    df = obj.cached(key, columns)
+    if df is None:
+        df = obj._fetch(key, columns)
+    
+    return df
+
+def _read_record(obj, columns=None):
+    """
+    Extract the record of a single interface object in a worker.
+    """
+    return obj.get_record(columns=columns)
+
+def _to_array(values):
+    """
+    Convert a column of record values to a typed array: numbers become int64 or float64
+    (None as NaN), anything else stays an object array.
+    """
+    if all(v is None or (isinstance(v, (int, float, np.number)) and not isinstance(v, bool)) for v in values):
+        if any(v is None for v in values) or any(isinstance(v, (float, np.floating)) for v in values):
+            return np.array([np.nan if v is None else v for v in values], dtype=float)
+        return np.array(values, dtype=np.int64)
+    
+    return np.array(values, dtype=object)
 
 #%%
 class DataPool(object):
@@ -14,62 +59,725 @@ class DataPool(object):
 
         Args:
             input_item (str): The input item to search for files.
-            interface (class): The interface class to create objects from files.
+            interface (class or Registry): The interface class to create objects from files, or a
+                                           Registry that chooses the interface of each file.
+            ftype (str, optional): Required file extension, e.g. '.zip'. Defaults to None.
+            pattern (str, optional): A regular expression searched in the file names. Defaults to None.
+            glob (str, optional): A shell pattern matched against the file names. Defaults to None.
+            index_file (str, optional): A JSON file index persisted between pool builds, so that only
+                                        changed directories are listed again. Defaults to None.
+            cache_bytes (int, optional): Memory budget of a dataframe cache private to this pool.
+                                         If not given, the cache shared by all interface objects is used.
+            cache_dir (str, optional): Directory of an on-disk columnar cache for the parsed files.
+                                       Requires pyarrow. Defaults to no disk cache.
+            lazy (bool, optional): Create the interface objects only when they are needed.
+                                   Defaults to False.
+            stats_file (str, optional): A JSON file to persist the signal statistics used by ``query``.
+                                        Defaults to None, which keeps them in memory.
+            dtype_policy (str or list, optional): Compact dtypes for the parsed files and the combined
+                                                  results, 'float32', 'downcast' and/or 'categorical',
+                                                  see ``djsurfer.dtypes``. Defaults to None.
 
         Attributes:
+            files (list): The files found.
             objs (list): A list of objects created from the files found.
+            cache (FrameCache): The dataframe cache used by the objects of the pool.
+            errors (dict): Exceptions of files that failed in the last ``load``, keyed by path.
+            stats (StatsIndex): The per-file signal statistics, see ``update_stats``.
+            interfaces (dict): The interface class of each file.
 
         """
         pattern = kwargs.pop('pattern', None)
         file_extension = kwargs.pop('ftype', None)
-        if file_extension is None:        
-            files = Path(input_item).rglob('*') # find all files in directory
+        glob = kwargs.pop('glob', None)
+        index_file = kwargs.pop('index_file', None)
+        cache_bytes = kwargs.pop('cache_bytes', None)
+        cache_dir = kwargs.pop('cache_dir', None)
+        lazy = kwargs.pop('lazy', False)
+        stats_file = kwargs.pop('stats_file', None)
+        self.dtype_policy = kwargs.pop('dtype_policy', None)
+        dtype_rules(self.dtype_policy)  # fail early on an unknown policy
+        
+        self.interface = interface
+        self.disk_cache = None if cache_dir is None else DiskCache(cache_dir)
+        
+        if cache_bytes is None:
+            # all interfaces share the cache of DataInterface unless a subclass defines its own
+            self.cache = interface.cache if isinstance(interface, type) else DataInterface.cache
         else:
-            files = []
-            if pattern is not None:
-                regex = re.compile(pattern)
+            self.cache = FrameCache(max_bytes=cache_bytes)
+        
+        # find all files in directory, sorted for a deterministic order
+        self.root = input_item
+        self.index = None if index_file is None else FileIndex(index_file)
+        self._filters = dict(ftype=file_extension, pattern=pattern, glob=glob)
+        files = self._scan()
+        
+        self.files = files
+        self.errors = {}
+        self.stats = StatsIndex(stats_file)
+        self._objs = None
+        if len(files) == 0:
+            print("No specific file found.")
+        if not lazy:
+            self._objs = [self._make_obj(file) for file in files] # create objects from files
+    
+    @property
+    def objs(self):
+        """
+        The interface objects of the datapool, created on first access in lazy mode.
+        """
+        if self._objs is None:
+            self._objs = [self._make_obj(file) for file in self.files]
+        
+        return self._objs
+    
+    def rescan(self):
+        """
+        Search the directory again and update the datapool with added and removed files.
+
+        Objects of files that are still present are kept together with their cache entries.
+
+        Returns:
+            tuple: (added, removed) lists of file paths.
+        """
+        files = self._scan()
+        if files == self.files:
+            return [], []
+        
+        added = sorted(set(files) - set(self.files))
+        removed = sorted(set(self.files) - set(files))
+        if self._objs is not None:
+            objs = dict(zip(self.files, self._objs))
+            self._objs = [objs[file] if file in objs else self._make_obj(file) for file in files]
+        self.files = files
+        
+        return added, removed
+    
+    def _scan(self):
+        
+        with span('discover', self.root):
+            files = scan_files(self.root, index=self.index, **self._filters)
+            if isinstance(self.interface, Registry):
+                self.interfaces = self.interface.dispatch(files)
+                files = list(self.interfaces)
             else:
-                regex = re.compile('.*')
-            for root, _, filenames in os.walk(input_item):
-                for filename in filenames:
-                    if filename.endswith(file_extension) and regex.search(filename):
-                        files.append(os.path.join(root, filename))
-
-        if len(files) != 0:
-            self.objs = [interface(file) for file in files] # create objects from files
+                self.interfaces = dict.fromkeys(files, self.interface)
+        
+        return files
+    
+    def _make_obj(self, file):
+        
+        obj = self.interfaces[file](file)
+        obj.cache = self.cache
+        if self.disk_cache is not None:
+            obj.disk_cache = self.disk_cache
+        if self.dtype_policy is not None:
+            obj.dtype_policy = self.dtype_policy
+        
+        return obj
+    
+    def _iter_objs(self):
+        
+        # in lazy mode the objects are created one by one and not kept
+        if self._objs is not None:
+            yield from self._objs
         else:
-            print("No specific file found.")
+            for file in self.files:
+                yield self._make_obj(file)
+    
+    def iter_frames(self, columns=None):
+        """
+        Iterate over the dataframes of the datapool one file at a time.
+
+        Frames that are not cached already are read without being put into the
+        memory cache, so only one of them is held at a time.
+
+        Args:
+            columns (list, optional): Read only these columns (signals). Defaults to None.
+
+        Yields:
+            tuple: (name, pandas.DataFrame) for each file.
+        """
+        for obj in self._iter_objs():
+            key = obj.cache_key()
+            df = obj.cached(key, columns)
+            if df is None:
+                df = obj._fetch(key, columns)
+            yield obj.name, df
+            del df
+    
+    def iter_signal(self, name):
+        """
+        Iterate over a signal of the datapool one file at a time.
+
+        Files that do not contain the signal are skipped.
+
+        Args:
+            name (str): The name of the signal.
+
+        Yields:
+            tuple: (file name, pandas.Series) for each file containing the signal.
+        """
+        for file_name, df in self.iter_frames(columns=[name]):
+            if name in df.columns:
+                yield file_name, df[name]
+    
+    def map_reduce(self, func, reducer, columns=None, initial=None):
+        """
+        Apply a function to each dataframe and combine the results, streaming over the files.
+
+        Args:
+            func (callable): Called with each dataframe, returns a partial result.
+            reducer (callable): Called with two partial results, returns the combined result.
+            columns (list, optional): Read only these columns (signals). Defaults to None.
+            initial (optional): The start value of the reduction. Defaults to None, which starts
+                                with the result of the first file.
+
+        Returns:
+            The reduced result, or initial if the datapool is empty.
+        """
+        result = initial
+        first = initial is None
+        for _, df in self.iter_frames(columns=columns):
+            value = func(df)
+            if first:
+                result, first = value, False
+            else:
+                result = reducer(result, value)
         
-    def get_signal(self, name):
+        return result
+        
+    def iter_chunks(self, chunksize=100000, columns=None):
+        """
+        Iterate over the datapool in chunks of rows, so that files larger than memory can be processed.
+
+        Args:
+            chunksize (int, optional): The number of rows per chunk. Defaults to 100000.
+            columns (list, optional): Read only these columns (signals). Defaults to None.
+
+        Yields:
+            tuple: (file name, pandas.DataFrame) for each chunk, the chunks of a file are consecutive.
+        """
+        for obj in self._iter_objs():
+            for chunk in obj.iter_chunks(chunksize=chunksize, columns=columns):
+                yield obj.name, chunk
+    
+    @traced('summarize')
+    def summarize(self, names, chunksize=100000):
+        """
+        Compute count, min, max and mean of signals per file, reading the files chunk by chunk.
+
+        Args:
+            names (list): The names of the signals.
+            chunksize (int, optional): The number of rows per chunk. Defaults to 100000.
+
+        Returns:
+            pandas.DataFrame: One row per file and signal found in it, with the columns
+                              file, signal, count, min, max and mean.
+        """
+        names = list(names)
+        stats = {}
+        for file_name, chunk in self.iter_chunks(chunksize=chunksize, columns=names):
+            for name in names:
+                if name in chunk.columns:
+                    stats.setdefault((file_name, name), RunningStats()).update(chunk[name])
+        
+        rows = [dict(file=file_name, signal=name, **s.to_dict()) for (file_name, name), s in stats.items()]
+        
+        return pd.DataFrame(rows, columns=['file', 'signal', 'count', 'min', 'max', 'mean'])
+    
+    @traced('histogram')
+    def histogram(self, name, bins=10, range=None, chunksize=100000):
+        """
+        Compute the histogram of a signal over all files, reading the files chunk by chunk.
+
+        Args:
+            name (str): The name of the signal.
+            bins (int or array-like, optional): The number of bins or the bin edges. Defaults to 10.
+            range (tuple, optional): (min, max) of the bins if bins is a number. Defaults to None,
+                                     which takes the range of the signal in an extra pass over the files.
+            chunksize (int, optional): The number of rows per chunk. Defaults to 100000.
+
+        Returns:
+            tuple: (counts, bin edges) as numpy.ndarray, like numpy.histogram.
+        """
+        if np.ndim(bins) == 0:
+            if range is None:
+                total = RunningStats()
+                for _, chunk in self.iter_chunks(chunksize=chunksize, columns=[name]):
+                    if name in chunk.columns:
+                        total.update(chunk[name])
+                range = (total.min, total.max) if total.count else (0.0, 1.0)
+            edges = np.histogram_bin_edges([], bins=bins, range=range)
+        else:
+            edges = np.asarray(bins, dtype=float)
+        
+        counts = np.zeros(len(edges) - 1, dtype=np.int64)
+        for _, chunk in self.iter_chunks(chunksize=chunksize, columns=[name]):
+            if name in chunk.columns:
+                values = chunk[name].to_numpy(dtype=float)
+                counts += np.histogram(values[~np.isnan(values)], bins=edges)[0]
+        
+        return counts, edges
+        
+    @traced('update_stats')
+    def update_stats(self, names=None, time_base='time', chunksize=100000):
+        """
+        Bring the signal statistics of all files up to date.
+
+        Only files that are new or changed since the last update are read, chunk by chunk.
+        Entries of removed files are dropped. Files that fail are recorded in ``errors``.
+
+        Args:
+            names (list, optional): The signals to summarize. Defaults to None, which summarizes all signals.
+            time_base (str, optional): The signal that gives the time span of a file. Defaults to 'time'.
+            chunksize (int, optional): The number of rows per chunk. Defaults to 100000.
+
+        Returns:
+            int: The number of files that were read.
+        """
+        columns = None if names is None else list(dict.fromkeys(list(names) + [time_base]))
+        changed = self.stats.prune(self.files)
+        self.errors = {}
+        
+        n = 0
+        for obj in self._iter_objs():
+            key = obj.cache_key()
+            if key is None or self.stats.get(obj.path, key, names) is not None:
+                continue
+            
+            signals = {}
+            try:
+                for chunk in obj.iter_chunks(chunksize=chunksize, columns=columns):
+                    for name in chunk.columns:
+                        if names is None or name in columns:
+                            signals.setdefault(name, RunningStats()).update(
+                                pd.to_numeric(chunk[name], errors='coerce'))
+            except Exception as e:
+                self.errors[str(obj.path)] = e
+                continue
+            
+            span = signals.get(time_base)
+            if names is not None and time_base not in names:
+                signals.pop(time_base, None)
+            span = None if span is None or span.count == 0 else (span.min, span.max)
+            
+            self.stats.put(obj.path, key, names, signals, span=span)
+            changed = True
+            n += 1
+        
+        if changed and self.stats.path is not None:
+            self.stats.save()
+        
+        return n
+    
+    def stats_table(self, **kwargs):
+        """
+        Returns the signal statistics of the files of the datapool as a table, see ``StatsIndex.table``.
+
+        Args:
+            **kwargs: Passed on to ``update_stats``.
+
+        Returns:
+            pandas.DataFrame: One row per file with the columns start, end and '<signal>.<stat>'.
+        """
+        self.update_stats(**kwargs)
+        
+        return self.stats.table(self.files)
+    
+    @traced('query')
+    def query(self, expr, **kwargs):
+        """
+        Select files by the statistics of their signals without loading their data.
+
+        The expression is evaluated with ``pandas.DataFrame.query`` on the statistics table.
+        Signals are referenced as '<signal>.<stat>' with stat one of count, min, max, mean
+        and present, e.g. 'p_MC_Model.max > 150 and end - start > 10'. Files without the
+        signal have NaN statistics and never match a comparison.
+
+        Args:
+            expr (str): The query expression.
+            **kwargs: Passed on to ``update_stats``.
+
+        Returns:
+            list: The paths of the matching files.
+        """
+        table = self.stats_table(**kwargs)
+        stats = '|'.join(STATS + ('present',))
+        expr = re.sub(rf'(?<![`\w.])([A-Za-z_]\w*)\.({stats})\b', lambda m: f'`{m.group(0)}`', expr)
+        
+        missing = [name for name in re.findall(r'`([^`]*)`', expr) if name not in table.columns]
+        for name in missing:
+            # a signal that no file contains
+            table[name] = False if name.endswith('.present') else np.nan
+        
+        return list(table.query(expr).index)
+    
+    async def aload(self, concurrency=16, columns=None):
+        """
+        Load all files of the datapool with asyncio, overlapping the file system latency of many files.
+
+        Stat, read and parse of each file run in a thread pool of ``concurrency`` threads,
+        so on a network share up to that many requests are in flight at a time. The
+        results are put into the cache like with ``load``; failed files are recorded in ``errors``.
+
+        Example:
+            frames = asyncio.run(pool.aload(concurrency=64))
+
+        Args:
+            concurrency (int, optional): The maximum number of files read at a time. Defaults to 16.
+            columns (list, optional): Load only these columns (signals) of each file. Defaults to None.
+
+        Returns:
+            list: The dataframes in the order of ``objs``, None for files that failed to load.
+        """
+        loop = asyncio.get_running_loop()
+        self.errors = {}
+        
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            results = await asyncio.gather(*(loop.run_in_executor(pool, obj.load, columns) for obj in self.objs), 
+                                           return_exceptions=True)
+        
+        frames = []
+        for obj, result in zip(self.objs, results):
+            if isinstance(result, Exception):
+                self.errors[str(obj.path)] = result
+                result = None
+            frames.append(result)
+        
+        if self.errors:
+            print(f"{len(self.errors)} of {len(self.objs)} files could not be loaded.")
+        
+        return frames
+    
+    async def aiter_frames(self, concurrency=16, columns=None):
+        """
+        Iterate asynchronously over the dataframes of the datapool, reading up to ``concurrency`` files at a time.
+
+        The frames are yielded as soon as they are read, so their order may differ from ``files``.
+        Like ``iter_frames``, frames are not put into the memory cache and at most ``concurrency``
+        of them are held at a time. Failed files are skipped and recorded in ``errors``.
+
+        Example:
+            async for name, df in pool.aiter_frames():
+                ...
+
+        Args:
+            concurrency (int, optional): The maximum number of files read at a time. Defaults to 16.
+            columns (list, optional): Read only these columns (signals). Defaults to None.
+
+        Yields:
+            tuple: (name, pandas.DataFrame) for each file that could be read.
+        """
+        loop = asyncio.get_running_loop()
+        self.errors = {}
+        objs = self._iter_objs()
+        pending = {}
+        
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            try:
+                while True:
+                    # keep the window of files in flight filled
+                    for obj in objs:
+                        pending[loop.run_in_executor(pool, _read_frame, obj, columns)] = obj
+                        if len(pending) >= concurrency:
+                            break
+                    if not pending:
+                        break
+                    
+                    done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                    for future in done:
+                        obj = pending.pop(future)
+                        try:
+                            df = future.result()
+                        except Exception as e:
+                            self.errors[str(obj.path)] = e
+                            continue
+                        yield obj.name, df
+            finally:
+                for future in pending:
+                    future.cancel()
+    
+    @traced('to_table')
+    def to_table(self, columns=None, workers=None, executor='thread'):
+        """
+        Collect one record per file into a single table, e.g. the fields of report files.
+
+        The values are gathered as plain column lists and the typed DataFrame is built once
+        at the end, instead of concatenating one small DataFrame per file. Files that fail
+        are left out and recorded in ``errors``.
+
+        Args:
+            columns (list, optional): The fields to collect. Defaults to None, which collects all fields.
+            workers (int, optional): Extract the records with this many parallel workers.
+                                     Defaults to None, which reads the files one after another.
+            executor (str, optional): 'thread' or 'process', see ``load``. Defaults to 'thread'.
+
+        Returns:
+            pandas.DataFrame: One row per file with the file name in column 'file'.
+        """
+        executors = {'thread': ThreadPoolExecutor, 'process': ProcessPoolExecutor}
+        if executor not in executors:
+            raise ValueError(f"Unknown executor '{executor}', expected one of {list(executors)}.")
+        
+        self.errors = {}
+        table = {'file': []}
+        
+        def collect(obj, get):
+            try:
+                record = get()
+            except Exception as e:
+                self.errors[str(obj.path)] = e
+                return
+            n = len(table['file'])
+            for name, value in record.items():
+                if name not in table:
+                    table[name] = [None] * n
+                table[name].append(value)
+            table['file'].append(obj.name)
+            for values in table.values():
+                if len(values) == n:
+                    values.append(None)
+        
+        if workers is None:
+            for obj in self._iter_objs():
+                collect(obj, lambda: obj.get_record(columns=columns))
+        else:
+            with executors[executor](max_workers=workers) as pool:
+                futures = [(obj, pool.submit(_read_record, obj, columns)) for obj in self.objs]
+                for obj, future in futures:
+                    collect(obj, future.result)
+        
+        out = pd.DataFrame({name: _to_array(values) for name, values in table.items()})
+        
+        return apply_dtype_policy(out, self.dtype_policy)
+    
+    @traced('load')
+    def load(self, workers=None, executor='thread', columns=None):
+        """
+        Parse all files of the datapool concurrently and put the results into the cache.
+
+        Objects whose dataframe is already cached are not parsed again. A file that fails
+        to parse does not abort the others; its exception is recorded in ``errors``.
+
+        Args:
+            workers (int, optional): Number of parallel workers. Defaults to the number of CPUs.
+            executor (str, optional): 'thread' or 'process'. Use 'process' for CPU-bound parsers
+                                      written in pure Python. Defaults to 'thread'.
+            columns (list, optional): Load only these columns (signals) of each file. Defaults to None.
+
+        Returns:
+            list: The dataframes in the order of ``objs``, None for files that failed to parse.
+        """
+        executors = {'thread': ThreadPoolExecutor, 'process': ProcessPoolExecutor}
+        if executor not in executors:
+            raise ValueError(f"Unknown executor '{executor}', expected one of {list(executors)}.")
+
+        self.errors = {}
+        frames = [None] * len(self.objs)
+        futures = {}
+
+        with executors[executor](max_workers=workers) as pool:
+            for i, obj in enumerate(self.objs):
+                key = obj.cache_key()
+                df = obj.cached(key, columns)
+                if df is not None:
+                    frames[i] = df
+                else:
+                    futures[i] = (pool.submit(_read_df, obj, key, columns), key)
+
+            for i, (future, key) in futures.items():
+                obj = self.objs[i]
+                try:
+                    frames[i] = future.result()
+                except Exception as e:
+                    self.errors[str(obj.path)] = e
+                    continue
+                if key is not None:
+                    obj.store(frames[i], key, columns)
+
+        if self.errors:
+            print(f"{len(self.errors)} of {len(self.objs)} files could not be loaded.")
+
+        return frames
+
+    def of_type(self, interface):
+        """
+        Returns the objects of the datapool created with an interface, e.g. in a mixed pool.
+
+        Args:
+            interface (class): The interface class, subclasses included.
+
+        Returns:
+            list: The objects in the order of ``files``.
+        """
+        # in lazy mode only the objects of this interface are created
+        if self._objs is not None:
+            return [obj for obj in self._objs if isinstance(obj, interface)]
+        
+        return [self._make_obj(file) for file in self.files if issubclass(self.interfaces[file], interface)]
+    
+    def memory_report(self):
+        """
+        Returns the memory held by the cached dataframes of the datapool, without loading any file.
+
+        Use ``djsurfer.dtypes.memory_report`` for the footprint of a single dataframe per column.
+
+        Returns:
+            pandas.DataFrame: One row per file with the columns rows, cols, nbytes and dtypes
+                              (counts per dtype), NaN for files that are not cached.
+        """
+        report = {'rows': [], 'cols': [], 'nbytes': [], 'dtypes': []}
+        names = []
+        for obj in self._iter_objs():
+            names.append(obj.name)
+            df = obj.cached(obj.cache_key())
+            if df is None:
+                for values in report.values():
+                    values.append(None)
+                continue
+            counts = df.dtypes.astype(str).value_counts()
+            report['rows'].append(df.shape[0])
+            report['cols'].append(df.shape[1])
+            report['nbytes'].append(frame_nbytes(df))
+            report['dtypes'].append(', '.join(f'{t}:{n}' for t, n in counts.items()))
+        
+        return pd.DataFrame({name: _to_array(values) for name, values in report.items()}, 
+                            index=pd.Index(names, name='file'))
+    
+    def invalidate(self):
+        """
+        Drop the cached dataframes of all objects in the datapool.
+        """
+        for obj in self.objs:
+            obj.invalidate()
+        
+    @traced('get_signal')
+    def get_signal(self, name, time_base=None, freq=None, method='nearest', grid=None):
         """
         Retrieve a signal from the datapool.
 
+        Without freq and grid, the signals are joined on their raw index. With freq or grid,
+        each signal is resampled onto a common time grid, which gives a dense matrix of
+        predictable size even if the files have different sampling rates.
+
         Parameters:
         - name (str): The name of the signal to retrieve.
+        - time_base (str, optional): The column holding the time stamps, e.g. 'time' for D97 files.
+          Defaults to None, which uses the index.
+        - freq (float, optional): The step of a regular grid spanning the time range of all files.
+          Defaults to None.
+        - method (str, optional): 'nearest', 'linear' or 'ffill'. Defaults to 'nearest'.
+        - grid (array-like, optional): Explicit time stamps to resample to instead of freq. Defaults to None.
 
         Returns:
-        - out (pd.DataFrame): A DataFrame containing the signal data.
+        - out (pd.DataFrame): A DataFrame containing the signal data, one column per file.
         """
-        dats = []
+        columns = [name] if time_base is None else [name, time_base]
         
-        for obj in self.objs:
-            df = obj.dataframe
+        if freq is None and grid is None:
+            dats = []
             
-            if name in obj.dataframe.columns:
-                dats.append(df[name])
+            for obj in self.objs:
+                df = obj.load(columns=columns) # only the requested signal is read from the file
                 
-            else:
-                dats.append(pd.Series(np.nan*np.ones(len(self.index)), index=df.index))
-
-        out = pd.concat(dats, axis=1)
-        out.columns = [obj.name for obj in self.objs]
-        
-        return out
+                if name in df.columns and time_base is None:
+                    dats.append(df[name])
+                elif name in df.columns and time_base in df.columns:
+                    dats.append(df.set_index(time_base)[name])
+                elif time_base is None:
+                    dats.append(pd.Series(np.nan*np.ones(len(df.index)), index=df.index))
+                elif time_base in df.columns:
+                    # the signal is missing, keep the time stamps of the file on the shared axis
+                    dats.append(pd.Series(np.nan*np.ones(len(df.index)), index=pd.Index(df[time_base])))
+                else:
+                    # without the time base the row numbers would be mixed into the time axis
+                    dats.append(pd.Series(dtype=float))
 
+            with span('concat', name) as info:
+                out = info['frame'] = apply_dtype_policy(pd.concat(dats, axis=1), self.dtype_policy)
+            out.columns = [obj.name for obj in self.objs]
             
+            return out
         
+        signals = []
+        for obj in self.objs:
+            df = obj.load(columns=columns)
+            if name not in df.columns or (time_base is not None and time_base not in df.columns):
+                signals.append(None)
+                continue
+            t = df.index.values if time_base is None else df[time_base].values
+            signals.append((np.asarray(t, dtype=float), df[name].to_numpy(dtype=float, na_value=np.nan)))
         
+        if grid is None:
+            spans = [(np.nanmin(t), np.nanmax(t)) for t, _ in filter(None, signals) if len(t) > 0]
+            grid = make_grid(spans, freq)
+        grid = np.asarray(grid, dtype=float)
         
+        # the resampled matrix is allocated in float32 right away under a float32 policy
+        dtype = np.float32 if 'float32' in dtype_rules(self.dtype_policy) else float
+        data = np.full((len(grid), len(self.objs)), np.nan, dtype=dtype)
+        with span('resample', name):
+            for j, signal in enumerate(signals):
+                if signal is not None:
+                    data[:, j] = resample(signal[0], signal[1], grid, method=method)
         
+        out = pd.DataFrame(data, index=pd.Index(grid, name=time_base or 'time'), 
+                           columns=[obj.name for obj in self.objs])
         
-        
\ No newline at end of file
+        return apply_dtype_policy(out, self.dtype_policy)
+    
+    @traced('get_signals')
+    def get_signals(self, names, how='wide', workers=None):
+        """
+        Retrieve several signals from the datapool in a single pass over the files.
+
+        Each file is read once with only the requested signals.
+
+        Parameters:
+        - names (list): The names of the signals to retrieve.
+        - how (str, optional): 'wide' returns one column per file and signal with MultiIndex
+          columns (file, signal). 'long' returns a tidy frame with the columns
+          file, index, signal and value. Defaults to 'wide'.
+        - workers (int, optional): Read the files with this many parallel threads, see ``load``.
+          Defaults to None, which reads them one after another.
+
+        Returns:
+        - out (pd.DataFrame): A DataFrame containing the signal data.
+        """
+        if how not in ('wide', 'long'):
+            raise ValueError(f"Unknown layout '{how}', expected 'wide' or 'long'.")
+        
+        names = list(names)
+        if workers is None:
+            frames = (obj.load(columns=names) for obj in self.objs)
+        else:
+            frames = self.load(workers=workers, columns=names)
+        
+        parts = []
+        for obj, df in zip(self.objs, frames):
+            if df is None:
+                df = pd.DataFrame(columns=names)
+            
+            if how == 'wide':
+                parts.append(df.reindex(columns=names))
+            else:
+                part = df.reindex(columns=[n for n in names if n in df.columns])
+                part = part.rename_axis('index').reset_index().melt(id_vars='index', var_name='signal', value_name='value')
+                part.insert(0, 'file', obj.name)
+                parts.append(part)
+        
+        if how == 'wide':
+            if len(parts) == 0:
+                return pd.DataFrame(columns=pd.MultiIndex.from_tuples([], names=['file', 'signal']))
+            with span('concat', how) as info:
+                out = info['frame'] = apply_dtype_policy(
+                    pd.concat(parts, axis=1, keys=[obj.name for obj in self.objs], names=['file', 'signal']), self.dtype_policy)
+        else:
+            if len(parts) == 0:
+                return pd.DataFrame(columns=['file', 'index', 'signal', 'value'])
+            with span('concat', how) as info:
+                out = info['frame'] = apply_dtype_policy(pd.concat(parts, ignore_index=True), self.dtype_policy)
+        
+        return out
@@ -0,0 +1,171 @@
+import fnmatch
+import json
+import os
+import re
+
+#%%
+def _walk(root):
+    """
+    Yield the paths of all regular files below root using os.scandir; directories are not yielded.
+    """
+    stack = [os.fspath(root)]
+    while stack:
+        dirpath = stack.pop()
+        try:
+            with os.scandir(dirpath) as it:
+                for entry in it:
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+                    elif entry.is_file():
+                        yield entry.path
+        except OSError:
+            # unreadable directory, skipped like os.walk does
+            continue
+
+def scan_files(root, ftype=None, pattern=None, glob=None, index=None):
+    """
+    Find the files below a directory that match the given filters.
+
+    Args:
+        root (str): The directory to search.
+        ftype (str or tuple, optional): Required file name ending(s), e.g. '.txt'. Defaults to None.
+        pattern (str, optional): A regular expression searched in the file name. Defaults to None.
+        glob (str, optional): A shell pattern matched against the file name, e.g. 'Kr_*'. Defaults to None.
+        index (FileIndex, optional): A file index used to skip unchanged directories. Defaults to None.
+
+    Returns:
+        list: The sorted paths of the matching files.
+    """
+    regex = None if pattern is None else re.compile(pattern)
+    paths = _walk(root) if index is None else index.update(root)
+
+    files = []
+    for path in paths:
+        filename = os.path.basename(path)
+        if ftype is not None and not filename.endswith(ftype):
+            continue
+        if regex is not None and not regex.search(filename):
+            continue
+        if glob is not None and not fnmatch.fnmatch(filename, glob):
+            continue
+        files.append(path)
+
+    return sorted(files)
+
+#%%
+class FileIndex(object):
+    """
+    A persisted index of the files (path, size, mtime) below one or more directories.
+
+    A directory is listed again only if its own mtime changed, i.e. if entries were
+    added, removed or renamed in it. Unchanged directories cost a single stat, which
+    makes rebuilding a pool on a network share cheap. Sizes and mtimes of files in
+    unchanged directories are those of the last listing; the dataframe caches check
+    the files themselves.
+
+    Args:
+        path (str, optional): The JSON file to persist the index in. Defaults to None, which keeps it in memory.
+    """
+
+    def __init__(self, path=None):
+
+        self.path = path
+        self.dirs = {}
+        if path is not None and os.path.isfile(path):
+            with open(path, 'r') as f:
+                self.dirs = json.load(f)
+
+    def __repr__(self):
+
+        return f'{self.__class__.__name__}("{self.path}", {len(self.dirs)} directories)'
+
+    def update(self, root):
+        """
+        Bring the index of a directory tree up to date.
+
+        Args:
+            root (str): The directory to index.
+
+        Returns:
+            list: The paths of all files below root.
+        """
+        root = os.fspath(root)
+        changed = False
+        seen = set()
+        files = []
+
+        stack = [root]
+        while stack:
+            dirpath = stack.pop()
+            try:
+                mtime = os.stat(dirpath).st_mtime_ns
+            except OSError:
+                continue
+            seen.add(dirpath)
+
+            entry = self.dirs.get(dirpath)
+            if entry is None or entry['mtime'] != mtime:
+                entry = self._scan(dirpath, mtime)
+                self.dirs[dirpath] = entry
+                changed = True
+
+            files.extend(os.path.join(dirpath, name) for name in entry['files'])
+            stack.extend(os.path.join(dirpath, name) for name in entry['dirs'])
+
+        # forget directories below root that have been removed
+        for dirpath in list(self.dirs):
+            if dirpath not in seen and (dirpath == root or dirpath.startswith(os.path.join(root, ''))):
+                del self.dirs[dirpath]
+                changed = True
+
+        if changed and self.path is not None:
+            self.save()
+
+        return files
+
+    def files(self, root=None):
+        """
+        Returns the indexed files with their size and mtime without touching the file system.
+
+        Args:
+            root (str, optional): Restrict the result to this directory tree. Defaults to None.
+
+        Returns:
+            dict: {path: (size, mtime_ns)}
+        """
+        prefix = None if root is None else os.path.join(os.fspath(root), '')
+        out = {}
+        for dirpath, entry in self.dirs.items():
+            if prefix is not None and dirpath != prefix[:-1] and not dirpath.startswith(prefix):
+                continue
+            for name, (size, mtime) in entry['files'].items():
+                out[os.path.join(dirpath, name)] = (size, mtime)
+
+        return out
+
+    def save(self):
+        """
+        Write the index to its JSON file.
+        """
+        tmp = f'{self.path}.tmp'
+        with open(tmp, 'w') as f:
+            json.dump(self.dirs, f)
+        os.replace(tmp, self.path)
+
+    @staticmethod
+    def _scan(dirpath, mtime):
+
+        files = {}
+        dirs = []
+        try:
+            with os.scandir(dirpath) as it:
+                for entry in it:
+                    if entry.is_dir(follow_symlinks=False):
+                        dirs.append(entry.name)
+                    elif entry.is_file():
+                        st = entry.stat()
+                        files[entry.name] = (st.st_size, st.st_mtime_ns)
+        except OSError:
+            pass
+
+        return {'mtime': mtime, 'files': files, 'dirs': dirs}
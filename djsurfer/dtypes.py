@@ -0,0 +1,98 @@
+import numpy as np
+import pandas as pd
+
+#%%
+POLICIES = ('float32', 'downcast', 'categorical')
+
+def dtype_rules(policy):
+    """
+    Normalize a dtype policy to a set of rules.
+
+    Args:
+        policy (str or list): None, one of POLICIES or a list of them.
+                              - 'float32': store float64 columns as float32, accepting the rounding.
+                              - 'downcast': store float64 columns as float32 only if no value changes,
+                                and integer columns in the smallest integer type holding their range.
+                              - 'categorical': store string columns with few distinct values as category.
+
+    Returns:
+        frozenset: The rules of the policy.
+    """
+    if policy is None:
+        return frozenset()
+    rules = frozenset([policy] if isinstance(policy, str) else policy)
+    unknown = rules - set(POLICIES)
+    if unknown:
+        raise ValueError(f"Unknown dtype policy {sorted(unknown)}, expected one of {POLICIES}.")
+
+    return rules
+
+def _target_dtype(s, rules, max_unique):
+
+    dtype = s.dtype
+    if dtype == np.float64:
+        if 'float32' in rules:
+            return np.float32
+        if 'downcast' in rules:
+            values = s.to_numpy()
+            if np.array_equal(values.astype(np.float32).astype(np.float64), values, equal_nan=True):
+                return np.float32
+    elif 'downcast' in rules and pd.api.types.is_integer_dtype(dtype) and len(s):
+        lo, hi = s.min(), s.max()
+        for candidate in (np.int8, np.int16, np.int32):
+            info = np.iinfo(candidate)
+            if info.min <= lo and hi <= info.max:
+                return candidate if np.dtype(candidate).itemsize < dtype.itemsize else None
+    elif 'categorical' in rules and len(s) > 1 and (dtype == object or pd.api.types.is_string_dtype(dtype)):
+        if not isinstance(dtype, pd.CategoricalDtype) and s.nunique() <= max_unique * len(s):
+            return 'category'
+
+    return None
+
+def apply_dtype_policy(df, policy, max_unique=0.5):
+    """
+    Convert the columns of a dataframe to more compact dtypes.
+
+    Args:
+        df (pandas.DataFrame): The dataframe.
+        policy (str or list): The dtype policy, see ``dtype_rules``.
+        max_unique (float, optional): The 'categorical' rule converts string columns with at most
+                                      this ratio of distinct values to rows. Defaults to 0.5.
+
+    Returns:
+        pandas.DataFrame: The converted dataframe, or df itself if no column changes.
+    """
+    rules = dtype_rules(policy)
+    if not rules or df is None:
+        return df
+
+    targets = [_target_dtype(df.iloc[:, i], rules, max_unique) for i in range(df.shape[1])]
+    if all(t is None for t in targets):
+        return df
+
+    if df.columns.is_unique:
+        return df.astype({col: t for col, t in zip(df.columns, targets) if t is not None})
+
+    # duplicate column labels cannot be addressed by name
+    parts = [df.iloc[:, i] if t is None else df.iloc[:, i].astype(t) for i, t in enumerate(targets)]
+    out = pd.concat(parts, axis=1)
+    out.columns = df.columns
+
+    return out
+
+def memory_report(df):
+    """
+    Returns the memory footprint of a dataframe per column.
+
+    Args:
+        df (pandas.DataFrame): The dataframe.
+
+    Returns:
+        pandas.DataFrame: dtype, nbytes (deep) and share of the total for the index and each column.
+    """
+    nbytes = df.memory_usage(index=True, deep=True)
+    dtypes = [str(df.index.dtype)] + [str(t) for t in df.dtypes]
+    total = nbytes.sum()
+
+    return pd.DataFrame({'dtype': dtypes, 'nbytes': nbytes.to_numpy(), 
+                         'share': nbytes.to_numpy() / total if total else 0.0}, index=nbytes.index)
@@ -1,6 +1,7 @@
 import pandas as pd
 import numpy as np
 from djsurfer.datainterface import DataInterface
+from djsurfer.resample import merge_ffill
 
 
 class D97_Object(DataInterface):
@@ -11,9 +12,11 @@ class D97_Object(DataInterface):
         path (str): The path to the D97 file.
         name (str, optional): The name of the D97 object. Defaults to None.
         comment (str, optional): Any additional comment about the text object. Defaults to None.
+        relevant_signals (list, optional): The names of the signals to read. Defaults to
+                                           ['p_MC_Model', 'RBMESG_RB_VirtualPressureSensor'].
     """
 
-    def __init__(self, path, name=None, comment=None,relevant_signals=[]):
+    def __init__(self, path, name=None, comment=None,relevant_signals=None):
 
         # relevant_signals is the list of the Signal names that will be readed from D97 file
         from d97parser import d97parser 
@@ -23,61 +26,63 @@ class D97_Object(DataInterface):
         super().__init__(path=path, name=name, comment=comment)
         
         # Define the Default relevant Signals
-        if relevant_signals == []:
-           self.relevant_signals = ['p_MC_Model','RBMESG_RB_VirtualPressureSensor']
+        if not relevant_signals:
+           relevant_signals = ['p_MC_Model','RBMESG_RB_VirtualPressureSensor']
+        self.relevant_signals = list(relevant_signals)
 
+    def __getstate__(self):
+
+        # Modules cannot be pickled, re-import d97parser after unpickling in a worker process.
+        state = super().__getstate__()
+        state.pop('d97parser', None)
+
+        return state
+
+    def __setstate__(self, state):
+        from d97parser import d97parser
+
+        self.__dict__.update(state)
+        self.d97parser = d97parser
+
+    def cache_params(self):
+
+        return tuple(self.relevant_signals)
         
-    def get_df(self): 
+    def get_df(self, columns=None): 
 
     # 
         """
         Read the d97 file and return its contents as a pandas DataFrame. (D97 has .zip)
 
+        Args:
+            columns (list, optional): The signals to load instead of relevant_signals. Defaults to None.
+
         Returns:
             pandas.DataFrame: The contents of the D97 file as a DataFrame.
         """
-          # Load data using d97parser package
+        if columns is None:
+            signals = self.relevant_signals
+        else:
+            signals = [c for c in columns if c != 'time']
+
+          # Load data using d97parser package, only the requested signals are read
         loaded_data = self.d97parser.load_signals(measurement_filepath=self.path,
-                                         add_signal_names=self.relevant_signals)
+                                         add_signal_names=signals)
 
     # Convert TimeSeries object from d97parser to pandas dataframe
-        if loaded_data ==None: 
-            pass
-
-        signalDf = pd.DataFrame()
-
-               
-        for tsSignal in self.relevant_signals:
-        
-            # Create temporary dataframe with TimeSeries information
-            tempDf = pd.DataFrame(data=loaded_data[tsSignal].values,
-                                index=np.round(loaded_data[tsSignal].timestamps, decimals=3),
-                                columns=[tsSignal])
-            
-            # Insert extracted information into pre-initialized dataframe
-            if len(signalDf) == 0:
-                # Initialize signal dataframe with temp dataframe
-                signalDf = tempDf
-            else:
-                # Outer join of new content with signal dataframe
-                signalDf = signalDf.join(tempDf, how='outer', lsuffix='', rsuffix='')
-        
-            # Forward-fill & back-fill the dataframe to deal with different sampling rates
-            signalDf.ffill(inplace=True)  
-            signalDf.bfill(inplace=True) 
+        if loaded_data is None: 
+            loaded_data = {}
 
-        # reindex of signalDf 
-    
-        signalDf['time'] = signalDf.index.values  # Convert index to column named 'time'
-        signalDf.reset_index(drop=True, inplace=True) # Reset index to integer values
-        
-        
-        self.signalDf = signalDf
+        # Time stamps are rounded to ms, then all signals are merged onto the union time axis
+        # in one pass. Forward-fill & back-fill deal with the different sampling rates.
+        signals = {tsSignal: (np.round(loaded_data[tsSignal].timestamps, decimals=3), loaded_data[tsSignal].values)
+                   for tsSignal in signals if tsSignal in loaded_data}
+        time, merged = merge_ffill(signals)
 
-        # Output summary of pandas dataframe
-        signalDf.describe()
+        signalDf = pd.DataFrame(merged)
+        signalDf['time'] = time  # time stamps as column named 'time' with integer index
 
-        return self.signalDf
+        return signalDf
 
 
     def to_excel(self, path):
@@ -87,7 +92,7 @@ class D97_Object(DataInterface):
         Args:
             path (str): The path to save the Excel file.
         """
-        self.signalDf.to_excel(path, index=True)
+        self.dataframe.to_excel(path, index=True)
 
     def to_csv(self, path):
         """
@@ -96,7 +101,7 @@ class D97_Object(DataInterface):
         Args:
             path (str): The path to save the CSV file.
         """
-        self.signalDf.to_csv(path, index=False)    
+        self.dataframe.to_csv(path, index=False)    
 
  #%%   
 
@@ -105,7 +110,7 @@ if __name__ == '__main__':
     from pathlib import Path
     
     obj = D97_Object('C:/project/PS_Sensor/measure/20240426/bl10inc3loc_pmc_ai_v3_V223_1690_240428_00.zip')
-    mydf= obj.get_df()
+    mydf= obj.dataframe
     print(mydf.head(10))
     obj.to_csv('C:/project/PS_Sensor/measure/20240426/bl10inc3loc_pmc_ai_v3_V223_1690_240428_00.csv')
 
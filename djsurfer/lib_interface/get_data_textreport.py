@@ -9,10 +9,91 @@ Version: 0.2
 """
 
 import re
+from collections import namedtuple
+from functools import lru_cache
 import pandas as pd
-import os
 from djsurfer.datainterface import DataInterface
 
+#%%
+# A field to extract from a report: column name, regular expression whose first group is the value,
+# and converter applied to the value.
+Field = namedtuple('Field', ['name', 'pattern', 'converter'])
+
+DEFAULT_FIELDS = (
+    Field("Filename", r"File Name:\s+(\S+)", str),
+    Field("Date", r"Report Date:\s+(\w+\s+\d+,\s+\d+)", str),
+    Field("Time", r"Time:\s+(\d{1,2}:\d{2}:\d{2})", str),
+    Field("NTC1_measured [KOhm]", r"NTC1\s+\d+\.\d+K\s+\d+\.\d+\w+\s+(\d+\.\d+)K", float),
+    Field("NTC2_measured [KOhm]", r"NTC2\s+\d+\.\d+K\s+\d+\.\d+\w+\s+(\d+\.\d+)K", float),
+    Field("Cap1_measured [pF]", r"C1\s+\d+\.\d+p\s+\d+\.\d+\w+\s+(\d+\.\d+)pF", float),
+    Field("Cap2_measured [pF]", r"C2\s+\d+\.\d+p\s+\d+\.\d+\w+\s+(\d+\.\d+)pF", float),
+    Field("IsoRes1_measured [MOhm]", r"5-51_Op\s+\d+\.\d+M\s+\D\s\d+\s\w\s+([><]?\s?\d+[\.\d+\s]?\s)M", str),
+    Field("IsoRes2_measured [MOhm]", r"6-52_Op\s+\d+\.\d+M\s+\D\s\d+\s\w\s+([><]?\s?\d+[\.\d+\s]?\s)M", str),
+    Field("Failure", r"Failures: \s+(\d+)", int),
+)
+
+@lru_cache(maxsize=None)
+def compile_fields(fields):
+    """
+    Compile a field spec into one regular expression that finds all fields in a single scan.
+
+    Each field becomes a named alternative of the combined expression. A match consumes the
+    text it covers, so a field overlapped by another match is searched again by ``extract_fields``.
+
+    Args:
+        fields (tuple): The Field tuples to extract.
+
+    Returns:
+        tuple: (compiled regex, {group name: (field, index of the value group)})
+    """
+    alternatives = []
+    lookup = {}
+    group = 1
+    for i, field in enumerate(fields):
+        ngroups = re.compile(field.pattern).groups
+        alternatives.append(f'(?P<_f{i}>{field.pattern})')
+        lookup[f'_f{i}'] = (field, group + 1 if ngroups else group)
+        group += ngroups + 1
+
+    return re.compile('|'.join(alternatives)), lookup
+
+def extract_fields(content, fields=DEFAULT_FIELDS):
+    """
+    Extract the first occurrence of every field from a report text in a single scan.
+
+    Args:
+        content (str): The report text.
+        fields (tuple, optional): The Field tuples to extract. Defaults to DEFAULT_FIELDS.
+
+    Returns:
+        dict: {field name: converted value or None if the field was not found}
+    """
+    fields = tuple(Field(*field) for field in fields)
+    regex, lookup = compile_fields(fields)
+
+    values = dict.fromkeys(field.name for field in fields)
+    missing = set(lookup)
+    for match in regex.finditer(content):
+        name = match.lastgroup
+        if name not in missing:
+            continue
+        field, group = lookup[name]
+        values[field.name] = field.converter(match.group(group))
+        missing.discard(name)
+        if not missing:
+            break
+
+    # a field can be hidden inside the match of another one, e.g. 'File Name:' without a value
+    # runs on into the next line, those fields are searched on their own
+    for name in missing:
+        field, _ = lookup[name]
+        match = re.search(field.pattern, content)
+        if match is not None:
+            values[field.name] = field.converter(match.group(1 if match.re.groups else 0))
+
+    return values
+
+#%%
 class TextReportObject(DataInterface):
     """
     A class representing a text object to extract data in a text file.
@@ -21,60 +102,59 @@ class TextReportObject(DataInterface):
         path (str): The path to the text file.
         name (str, optional): The name of the text object. Defaults to None.
         comment (str, optional): Any additional comment about the text object. Defaults to None.
+        fields (list, optional): Field(name, pattern, converter) tuples to extract. Defaults to DEFAULT_FIELDS.
+                                 Add own fields with e.g. ``list(DEFAULT_FIELDS) + [Field('NTC3', r'...', float)]``.
     """
 
-    def __init__(self,path, name=None,comment=None, delimiter=','):
+    def __init__(self,path, name=None,comment=None, delimiter=',', fields=DEFAULT_FIELDS):
 
         #Initialize the text interface object, passing the path, name, comment, chunk delimiter to the base class.
         super().__init__(path=path, name=name, comment=comment)
 
         #Default delimiter is a comma
         self.delimiter = delimiter
+        self.fields = tuple(Field(*field) for field in fields)
+
+    def cache_params(self):
+
+        return (self.delimiter,) + tuple((field.name, field.pattern, getattr(field.converter, '__name__', None)) 
+                                         for field in self.fields)
 
-    def get_df(self):
+    def get_df(self, columns=None):
         """
         Read the text file and return its selected contents as a pandas DataFrame.
 
+        Args:
+            columns (list, optional): The fields to return. Defaults to None, which returns all fields.
+
         Returns:
             pandas.DataFrame: The contents of the extracted data from text file as a DataFrame.
         """
+        # Create DataFrame with extracted data
+        data = self.get_record(columns=columns)
+        df = pd.DataFrame({name: [value] for name, value in data.items()})
+
+        return df
+
+    def get_record(self, columns=None):
+        """
+        Read the text file and return the extracted fields as a dict, without building a DataFrame.
+
+        Args:
+            columns (list, optional): The fields to return. Defaults to None, which returns all fields.
+
+        Returns:
+            dict: {field name: value or None if the field was not found}
+        """
         #open report file
-        with open(path, "r") as file:
+        with open(self.path, "r") as file:
             content =file.read()
 
+        fields = self.fields
+        if columns is not None:
+            fields = tuple(field for field in fields if field.name in columns)
 
-        failure_match = re.search(r"Failures: \s+(\d+)", content)
-        file_match = re.search(r"File Name:\s+(\S+)", content)
-        date_match =re.search(r"Report Date:\s+(\w+\s+\d+,\s+\d+)", content)
-        time_match = re.search(r"Time:\s+(\d{1,2}:\d{2}:\d{2})", content)
-        #time_match = re.search(r'Time:\s+(\d{1,2}:d{2}:\d{2})', content).group(1)
-        ntc1_match = re.search(r"NTC1\s+\d+\.\d+K\s+\d+\.\d+\w+\s+(\d+\.\d+)K", content)
-        ntc2_match = re.search(r"NTC2\s+\d+\.\d+K\s+\d+\.\d+\w+\s+(\d+\.\d+)K", content)
-        c1_match = re.search(r"C1\s+\d+\.\d+p\s+\d+\.\d+\w+\s+(\d+\.\d+)pF", content)
-        c2_match = re.search(r"C2\s+\d+\.\d+p\s+\d+\.\d+\w+\s+(\d+\.\d+)pF", content)
-        isoRes1_match = re.search(r"5-51_Op\s+\d+\.\d+M\s+\D\s\d+\s\w\s+([><]?\s?\d+[\.\d+\s]?\s)M", content)
-        isoRes2_match = re.search(r"6-52_Op\s+\d+\.\d+M\s+\D\s\d+\s\w\s+([><]?\s?\d+[\.\d+\s]?\s)M", content)
-
-        #print(isoRes1_match)
-        #print(ntc2_match)
-
-        # Create DataFrames with extracted data
-        data = {
-            "Filename": [file_match.group(1)] if file_match else [None],
-            "Date":[date_match.group(1)] if date_match else [None],
-            "Time":[time_match.group(1)] if time_match else [None],
-            #"NTC1_measured [KOhm]":[float(ntc1_match.group(1).replace("K",""))] if ntc1_match else [None],
-            "NTC1_measured [KOhm]":[float(ntc1_match.group(1))] if ntc1_match else [None],
-            "NTC2_measured [KOhm]":[float(ntc2_match.group(1))] if ntc2_match else [None],
-            "Cap1_measured [pF]":[float(c1_match.group(1))] if c1_match else [None],
-            "Cap2_measured [pF]":[float(c2_match.group(1))] if c2_match else [None],
-            "IsoRes1_measured [MOhm]":[isoRes1_match.group(1)] if isoRes1_match else [None],
-            "IsoRes2_measured [MOhm]":[isoRes2_match.group(1)] if isoRes2_match else [None],
-            "Failure":[int(failure_match.group(1))] if failure_match else [None]
-            }
-        df = pd.DataFrame(data)
-
-        return df
+        return extract_fields(content, fields)
 
 
     def to_excel(self, path):
@@ -1,7 +1,9 @@
 
+import io
 import pandas as pd
 import numpy as np
 from djsurfer.datainterface import DataInterface
+from djsurfer.profiling import span
 
 #%%
 class MeasTextObject_SY(DataInterface):       
@@ -67,50 +69,107 @@ class MeasTextObject_SY(DataInterface):
 
         # Total measured angle
         self.total_angle = 380     
+
+    def cache_params(self):
+
+        return (self.delimiter, self.total_angle)
     
-    def get_df(self):
+    def get_df(self, columns=None):
         """
         Read the measure data in txt format and return its contents as a pandas DataFrame.
 
+        Args:
+            columns (list, optional): The data columns to return, out of 'angle', 'theta' and 'radius'. Defaults to None.
+
         Returns:
             pandas.DataFrame: The contents of the measure data as a DataFrame.
         """
-        with open(self.path, 'r') as f:
-            lines = f.readlines()
-       
-       # read first 3 columns as X, Y and Z input
-        data = []
-        for line in lines:
-            line_data = line.strip().split(self.delimiter)
-            x, y, z = line_data[:3]
-            data.append({'X': x, 'Y': y, 'Z': z})
-        df = pd.DataFrame(data)
-
-        # clean up data, replace ',' with '.' if any
-        for col in df.columns:
-            if any(',' in value for value in df[col]):
-                df[col] = df[col].str.replace(',', '.')
-            df[col] = pd.to_numeric(df[col], errors='coerce')
-
-        # find the most frequent value in column 'Z' to prevent multiple Z value due to rounding tolerance
-        df['Z'] = abs(round(df['Z'], 1))
-        Z_shall_value = df['Z'].mode()[0]
-
-        # calculate measured angle in degree
-        df.index.name = 'angle_idx'
-        df['angle'] = df.index.values * self.total_angle / df.shape[0]
+        # read first 3 columns as X, Y and Z input, decimal commas are replaced in the raw buffer
+        with open(self.path, 'rb') as f:
+            raw = f.read()
+        if self.delimiter != ',' and b',' in raw:
+            raw = raw.replace(b',', b'.')
         
-        for grid_angle in [0, 90, 180, 270, 360]:
-            nearst_mp = (df['angle'] - grid_angle).abs().idxmin()
-            df.loc[nearst_mp, 'angle'] = grid_angle
+        xyz = pd.read_csv(io.BytesIO(raw), sep=self._sep(), header=None, usecols=[0, 1, 2], engine='c')
+        x, y, z = (pd.to_numeric(xyz[col], errors='coerce').to_numpy(dtype=float) for col in (0, 1, 2))
+
+        # find the most frequent value of Z to prevent multiple Z value due to rounding tolerance
+        z_values, z_counts = np.unique(self._round_z(z), return_counts=True)
+        Z_shall_value = z_values[np.argmax(z_counts)] if len(z_values) else np.nan
+
+        df = self._frame(x, y, 0, len(x), Z_shall_value)
+        
+        return self.select_columns(df, columns)
+
+    def iter_chunks(self, chunksize=100000, columns=None):
+        """
+        Iterate over the measure data in chunks of rows.
+
+        The file is read twice, first to count the points and find the Z value, then to
+        compute the chunks, so only one chunk of raw data is held in memory.
+
+        Args:
+            chunksize (int, optional): The number of rows per chunk. Defaults to 100000.
+            columns (list, optional): The data columns to return, out of 'angle', 'theta' and 'radius'. Defaults to None.
+
+        Yields:
+            pandas.DataFrame: The consecutive chunks with the same columns as get_df.
+        """
+        n = 0
+        counts = {}
+        for _, _, z in self._iter_xyz(chunksize):
+            n += len(z)
+            for value, count in zip(*np.unique(self._round_z(z), return_counts=True)):
+                counts[value] = counts.get(value, 0) + count
+        # ties go to the smallest value like in get_df
+        Z_shall_value = min(counts, key=lambda value: (-counts[value], value)) if counts else np.nan
+
+        start = 0
+        for x, y, _ in self._iter_xyz(chunksize):
+            yield self.apply_dtype_policy(self.select_columns(self._frame(x, y, start, n, Z_shall_value), columns))
+            start += len(x)
+
+    def _sep(self):
+
+        # a blank delimiter matches any run of whitespace
+        return r'\s+' if self.delimiter == ' ' else self.delimiter
+
+    def _iter_xyz(self, chunksize):
+
+        with pd.read_csv(self.path, sep=self._sep(), header=None, usecols=[0, 1, 2], dtype=str, engine='c', 
+                         chunksize=chunksize) as reader:
+            for chunk in reader:
+                if self.delimiter != ',':
+                    chunk = chunk.apply(lambda col: col.str.replace(',', '.', regex=False))
+                yield tuple(pd.to_numeric(chunk[col], errors='coerce').to_numpy(dtype=float) for col in (0, 1, 2))
+
+    @staticmethod
+    def _round_z(z):
+
+        z = np.abs(np.round(z, 1))
+
+        return z[~np.isnan(z)]
+
+    def _frame(self, x, y, start, n, Z_shall_value):
+        """
+        Compute angle, theta and radius of the points start to start + len(x) of a profile with n points.
+        """
+        # calculate measured angle in degree and snap the nearest points to the grid angles
+        idx = np.arange(start, start + len(x))
+        angle = idx * self.total_angle / n
+        grid = np.array([0, 90, 180, 270, 360])
+        lo = np.clip(np.floor(grid * n / self.total_angle).astype(int), 0, n - 1)
+        hi = np.clip(lo + 1, 0, n - 1)
+        nearest = np.where(np.abs(hi * self.total_angle / n - grid) < np.abs(lo * self.total_angle / n - grid), hi, lo)
+        inside = (nearest >= start) & (nearest < start + len(x))
+        angle[nearest[inside] - start] = grid[inside]
 
         # calculate measured radius, theta
-        df['theta'] = np.deg2rad(df['angle'])
-        df['radius'] = (df['X'] ** 2 + df['Y'] ** 2) ** 0.5
+        df = pd.DataFrame({'angle': angle, 'theta': np.deg2rad(angle), 'radius': np.sqrt(x ** 2 + y ** 2)}, 
+                          index=pd.RangeIndex(start, start + len(x), name='angle_idx'))
         
-        # remove unnecessary columns and reindex columns with MultiIndex 5 level:
+        # reindex columns with MultiIndex 5 level:
         # directory, model type, measure type, Z value and data (includes angle, theta, radius)
-        df.drop(columns=['X', 'Y', 'Z'], inplace=True)
         df.columns = pd.MultiIndex.from_product([[self.dirname], [self.model_type], [self.meas_type], [Z_shall_value], df.columns], 
                                                     names=['data_dir', 'model_type', 'meas_type', 'Z', 'data'])
         
@@ -124,7 +183,8 @@ class MeasObject_SY(DataInterface):
         path (str): The path to the text file.
         name (str, optional): The name of the text object. Defaults to None.
         comment (str, optional): Any additional comment about the text object. Defaults to None.
-        config (dict, optional): Configuration parameters for the data interface. Defaults to None. 
+        config (dict, optional): Configuration parameters for the data interface, e.g. 'dtype_policy'
+                                 for compact dtypes of the measure files. Defaults to None. 
     """
     def __init__(self, path, name=None, comment=None, config={}):
         from djsurfer.datapool import DataPool as dp        
@@ -161,26 +221,49 @@ class MeasObject_SY(DataInterface):
         self.meas_types_EZ = ('L6', 'L7', 'L8', 'L9', 'L10', 'S1', 'S2', 'S3', 'S4', 'S5')
         self.meas_types_FDR = ('FR', 'DR')
         
-        self.meas_datapool = dp(path, interface=MeasTextObject_SY, pattern=pattern, ftype=file_extension)
-        self.df_list = []
+        self.dtype_policy = config.pop('dtype_policy', None)
+        
+        self.meas_datapool = dp(path, interface=MeasTextObject_SY, pattern=pattern, ftype=file_extension, 
+                                dtype_policy=self.dtype_policy)
+        
+        # merged dataframe and the cache keys of the member files it was built from
+        self._merged = None
+        self._merged_keys = {}
 
-    def get_df(self):
+    def get_df(self, columns=None):
         """
         Read serie of dataframe of measure files and return a merged pandas DataFrame.
 
+        The merged dataframe is kept and updated incrementally: files added to the directory
+        are appended, and it is only rebuilt if a member file was changed or removed.
+
+        Args:
+            columns (list, optional): The data columns to return, out of 'angle', 'theta' and 'radius'. Defaults to None.
+
         Returns:
             pandas.DataFrame: The merged measure files as a DataFrame.
         """
-        for obj in self.meas_datapool.objs:
-            df = obj.dataframe
-            self.df_list.append(df)
-
-        df_merged = pd.concat(self.df_list, axis=1)
+        self.meas_datapool.rescan()
+        objs = self.meas_datapool.objs
+        keys = {obj.path: obj.cache_key() for obj in objs}
+
+        outdated = any(keys.get(path) != key for path, key in self._merged_keys.items())
+        if self._merged is None or outdated:
+            new_objs = objs
+            merged = []
+        else:
+            new_objs = [obj for obj in objs if obj.path not in self._merged_keys]
+            merged = [self._merged]
 
+        if new_objs or self._merged is None:
+            parts = merged + [obj.dataframe for obj in new_objs]
+            with span('merge', self.path) as info:
+                self._merged = info['frame'] = pd.concat(parts, axis=1) if parts else pd.DataFrame()
+            self._merged_keys = keys
 
-        return df_merged
+        return self.select_columns(self._merged, columns)
 
-    def plot_data(self, inp_path = None, outp_path = None, type_req = None, pos_req = None, z_req = None, color = 'blue'):
+    def plot_data(self, inp_path = None, outp_path = None, type_req = None, pos_req = None, z_req = None, color = 'blue', show = True):
         """
         plot data/data set to png file.
 
@@ -196,6 +279,8 @@ class MeasObject_SY(DataInterface):
                           EZ = [pos1, pos2n, pos2p, pos3, pos4]
             z_req(tuple): The customized Z position tuple to be plotted. Default is None.
 			color(str): The plot color. Default is blue.
+            show(bool): Show the figures interactively. If False, the figures are rendered without
+                        a GUI backend and only saved. Default is True.
         """        
         import os        
 
@@ -282,15 +367,144 @@ class MeasObject_SY(DataInterface):
         plot_data_dirnames = get_dirname(inp_path)
         plot_data_columns_combinations = arg_combinations(plot_data_dirnames, model_req, type_req)
         
+        df_all = self.dataframe
         for elem in plot_data_columns_combinations:
             try:
                 idx = pd.IndexSlice
-                df_plot = self.dataframe.loc[:, idx[elem[0], elem[1], elem[2], list(z_set), :]]
-                self.plot_data_set(outp_path, df_plot, color)
+                df_plot = df_all.loc[:, idx[elem[0], elem[1], elem[2], list(z_set), :]]
+                self.plot_data_set(outp_path, df_plot, color, show)
             except KeyError:
                     pass
 
-    def plot_data_set(self, outp_path, df_plot, color = 'blue'):
+    @staticmethod
+    def plot_file_name(df_plot):
+        """
+        Returns the png file name of a data set, built from directory, measure type and Z values.
+
+        Args:
+            df_plot: The dataframe of measure data to be plotted.
+
+        Returns:
+            str: The file name.
+        """
+        dirname = '_'.join(df_plot.columns.get_level_values(0).unique())
+        meas_type = '_'.join(df_plot.columns.get_level_values(2).unique())
+        data_set = df_plot.columns.get_level_values(3).unique().tolist()
+        plot_set_name = '_'.join(str(z) for z in data_set)
+
+        return dirname + '_' + meas_type + '_' + plot_set_name + '.png'
+
+    def render_all(self, outp_path = None, jobs = None, types = None, pos_sets = None, color = 'blue'):
+        """
+        Render the plots of all leaf directories, measure types and predefined position sets in parallel.
+
+        Every combination is sliced from the merged data in the main process and sent to a worker
+        process, which renders it without a GUI backend. A plot is skipped if its png exists and
+        was rendered from the same data and color before; the data hashes are kept in
+        ``_render_manifest.json`` in the output path.
+
+        Args:
+            outp_path (str): The path to save the png files. If not given the folder _out under the root path is used.
+            jobs (int): Number of worker processes. 1 renders in the main process. Default is the number of CPUs.
+            types (list): The measure types to render. Default is all measure types in the data.
+            pos_sets (list): The names of the predefined position sets to render. Default is all sets of each type.
+            color(str): The plot color. Default is blue.
+
+        Returns:
+            dict: {png path: 'rendered', 'skipped' or 'failed'}, the exceptions of failed plots are
+                  kept in ``render_errors``.
+        """
+        from concurrent.futures import ProcessPoolExecutor
+        import json
+        import os
+
+        if outp_path is None:
+            outp_path = os.path.join(self.path, '_out')
+        os.makedirs(outp_path, exist_ok=True)
+
+        manifest_path = os.path.join(outp_path, '_render_manifest.json')
+        manifest = {}
+        if os.path.isfile(manifest_path):
+            with open(manifest_path, 'r') as f:
+                manifest = json.load(f)
+
+        df_all = self.dataframe
+        if types is None:
+            types = df_all.columns.get_level_values('meas_type').unique().tolist()
+
+        # slice the data of every combination, workers only receive their own slice
+        tasks = []
+        status = {}
+        idx = pd.IndexSlice
+        for type_req in types:
+            if type_req in self.meas_types_EZ:
+                model_req, type_sets = 'EZ', self.meas_EZ_pos_sets
+            elif type_req == 'FR':
+                model_req, type_sets = 'FDR', self.meas_FR_pos_sets
+            elif type_req == 'DR':
+                model_req, type_sets = 'FDR', self.meas_DR_pos_sets
+            else:
+                continue
+            # a valid type may be absent from the data
+            in_type = (df_all.columns.get_level_values('model_type') == model_req) & \
+                      (df_all.columns.get_level_values('meas_type') == type_req)
+            if not in_type.any():
+                continue
+            df_type = df_all.loc[:, in_type]
+
+            for dirname in df_type.columns.get_level_values('data_dir').unique():
+                df_dir = df_type.loc[:, idx[dirname, :, :, :, :]]
+                z_full_set = set(df_dir.columns.get_level_values('Z'))
+                for pos_req, z_set in type_sets.items():
+                    if pos_sets is not None and pos_req not in pos_sets:
+                        continue
+                    z_list = [z for z in z_set if z in z_full_set]
+                    if not z_list:
+                        continue
+                    df_plot = df_dir.loc[:, idx[:, :, :, z_list, :]]
+                    outp_name = self.plot_file_name(df_plot)
+                    outp_full_path = os.path.join(outp_path, outp_name)
+                    digest = f'{pd.util.hash_pandas_object(df_plot.T).sum()}_{color}'
+                    if os.path.isfile(outp_full_path) and manifest.get(outp_name) == digest:
+                        status[outp_full_path] = 'skipped'
+                        continue
+                    tasks.append((outp_name, digest, df_plot))
+
+        def finish(outp_name, digest, result):
+            # a failing plot does not abort the others, it is rendered again next time
+            outp_full_path = os.path.join(outp_path, outp_name)
+            try:
+                result()
+            except Exception as e:
+                status[outp_full_path] = 'failed'
+                self.render_errors[outp_full_path] = e
+                return
+            status[outp_full_path] = 'rendered'
+            manifest[outp_name] = digest
+
+        self.render_errors = {}
+        try:
+            if jobs == 1:
+                for outp_name, digest, df_plot in tasks:
+                    finish(outp_name, digest, lambda: self.plot_data_set(outp_path, df_plot, color, False))
+            else:
+                with ProcessPoolExecutor(max_workers=jobs) as pool:
+                    futures = [(outp_name, digest, pool.submit(MeasObject_SY.plot_data_set, outp_path, df_plot, color, False))
+                               for outp_name, digest, df_plot in tasks]
+                    for outp_name, digest, future in futures:
+                        finish(outp_name, digest, future.result)
+        finally:
+            # keep the plots rendered so far even if the batch is interrupted
+            with open(manifest_path, 'w') as f:
+                json.dump(manifest, f, indent=1)
+
+        if self.render_errors:
+            print(f"{len(self.render_errors)} of {len(tasks)} plots could not be rendered.")
+
+        return status
+
+    @staticmethod
+    def plot_data_set(outp_path, df_plot, color = 'blue', show = True):
         """
         plot single data set to a png file.
 
@@ -299,20 +513,20 @@ class MeasObject_SY(DataInterface):
 
             df_plot: The dataframe of measure data to be plotted.
             color(str): The plot color
+            show(bool): Show the figure interactively. If False, the figure is rendered without
+                        pyplot and only saved. Default is True.
         """	
-        import matplotlib.pyplot as plt
+        from matplotlib.figure import Figure
+        from matplotlib.lines import Line2D
         import os
 
         # fetch measure data details to create output file name
         dirname = '_'.join(df_plot.columns.get_level_values(0).unique())
         meas_type = '_'.join(df_plot.columns.get_level_values(2).unique())
         data_set = df_plot.columns.get_level_values(3).unique().tolist()
-        plot_set_name = '_'.join(str(z) for z in data_set)
 
         # set output png file path
-        outp_name = dirname + '_' + meas_type + '_' + plot_set_name
-        outp_filetype = '.png'
-        outp_full_path = os.path.join(outp_path, outp_name + outp_filetype)
+        outp_full_path = os.path.join(outp_path, MeasObject_SY.plot_file_name(df_plot))
 
         # set plot label, alpha, axis min/max  
         z_labels = [f'Z={z}' for z in data_set]
@@ -327,12 +541,16 @@ class MeasObject_SY(DataInterface):
         data_min = round(radius_data.min().min(), 3)
         data_max = round(radius_data.max().max(), 3)
 
-        # configure figure and axes
-        fig = plt.figure(figsize=(16, 8), dpi=100)
+        # configure figure and axes, without pyplot no GUI backend is involved
+        if show:
+            import matplotlib.pyplot as plt
+            fig = plt.figure(figsize=(16, 8), dpi=100)
+        else:
+            fig = Figure(figsize=(16, 8), dpi=100)
         # plot first figure on position (1,1) of 2x1 in polor coordinates
-        ax1 = plt.subplot(211,projection='polar')
+        ax1 = fig.add_subplot(211, projection='polar')
         # plot second figure on position (2,1) of 2x1 in orthogonal coordinates 
-        ax2 = plt.subplot(212)
+        ax2 = fig.add_subplot(212)
 
         ax1.set_rlim(ax_min, ax_max)
         ax1.set_thetagrids(np.arange(0.0, 360.0, 90.0))
@@ -348,22 +566,26 @@ class MeasObject_SY(DataInterface):
         theta_360_mask = df_plot.xs('angle', level='data', axis=1) <= 360
         df_cut = df_plot[theta_360_mask.any(axis=1)]
 
+        # one scatter per Z level and axis from the column arrays
         for z, alpha in zip(data_set, alphas):
-            for idx, row in df_cut.iterrows():
-                radius = row.loc[(slice(None), slice(None), slice(None), z, 'radius')].values[0]
-                theta = row.loc[(slice(None), slice(None), slice(None), z, 'theta')].values[0]
-                angle = row.loc[(slice(None), slice(None), slice(None), z, 'angle')].values[0]
-                ax1.scatter(theta, radius, color=color, alpha=alpha, edgecolors='white', linewidths=0)
-                ax2.scatter(angle, radius, color=color, alpha=alpha, edgecolors='white', linewidths=0)
+            df_z = df_cut.xs(z, level='Z', axis=1)
+            radius, theta, angle = (df_z.xs(data, level='data', axis=1).iloc[:, 0].to_numpy() 
+                                    for data in ('radius', 'theta', 'angle'))
+            ax1.scatter(theta, radius, color=color, alpha=alpha, edgecolors='white', linewidths=0)
+            ax2.scatter(angle, radius, color=color, alpha=alpha, edgecolors='white', linewidths=0)
 
         # set figure subtile, comment, legend
         fig.suptitle(f'Cylinder r = {radius_ref} mm, {meas_type}, Z = {data_set}\n from {dirname}')
-        plt.figtext(0.9, 0.95, f'r_max = {data_max}\nr_min = {data_min}', ha='right', va='top', bbox=None)
-        data_legend = [plt.Line2D([0], [0], marker='o', color='w', markerfacecolor=color, alpha=alpha, markersize=5, label=label) for alpha, label in zip(alphas,z_labels)]
-        plt.legend(handles=data_legend, loc='upper center', bbox_to_anchor=(0.85, 0.9), fontsize=8, bbox_transform=plt.gcf().transFigure)
+        fig.text(0.9, 0.95, f'r_max = {data_max}\nr_min = {data_min}', ha='right', va='top', bbox=None)
+        data_legend = [Line2D([0], [0], marker='o', color='w', markerfacecolor=color, alpha=alpha, markersize=5, label=label) for alpha, label in zip(alphas,z_labels)]
+        ax2.legend(handles=data_legend, loc='upper center', bbox_to_anchor=(0.85, 0.9), fontsize=8, bbox_transform=fig.transFigure)
+
+        fig.savefig(outp_full_path)
+        if show:
+            plt.show()
+            plt.close(fig)
 
-        plt.savefig(outp_full_path)
-        plt.show()
+        return outp_full_path
 
 
 if __name__ == '__main__':
@@ -1,25 +1,98 @@
 
+import io
+import mmap
+import numpy as np
 import pandas as pd
 from djsurfer.datainterface import DataInterface
+from djsurfer.dtypes import dtype_rules
+
+# bytes scanned per step when searching line ends, rows tokenized per step in the mmap reader
+BLOCK_BYTES = 2**22
+BLOCK_ROWS = 2**16
+
+#%%
+def _iter_lines(buf, pos):
+    """
+    Scan a byte buffer from offset pos in blocks and yield (line end offsets, non-blank mask)
+    for the lines ending in each block. Lines of only whitespace are blank, like for the CSV parser.
+    """
+    size = len(buf)
+    content = False # the current line has a non-blank byte
+    while pos < size:
+        block = np.frombuffer(buf, dtype=np.uint8, count=min(BLOCK_BYTES, size - pos), offset=pos)
+        newlines = np.flatnonzero(block == 10)
+        # tab, line feed, carriage return and space are all <= 32, other control bytes do not occur in text files
+        nonws = block > 32
+        # whether each line segment of the block has a non-blank byte
+        starts = np.concatenate(([0], newlines + 1))
+        segments = np.logical_or.reduceat(nonws, starts[starts < len(block)])
+        del nonws
+        if len(newlines):
+            nonblank = segments[:len(newlines)].copy()
+            nonblank[0] |= content
+            content = bool(segments[len(newlines)]) if len(segments) > len(newlines) else False
+        else:
+            nonblank = segments[:0]
+            content = content or bool(segments[0])
+        pos += len(block)
+        yield pos - len(block) + newlines + 1, nonblank
+    
+    if content:
+        # last line without line break
+        yield np.array([size]), np.array([True])
+
+def _seek_lines(buf, pos, n):
+    """
+    Return the offset after the n-th non-blank line from offset pos of a byte buffer.
+    """
+    if n <= 0:
+        return pos
+    for ends, nonblank in _iter_lines(buf, pos):
+        idx = np.flatnonzero(nonblank)
+        if len(idx) >= n:
+            return int(ends[idx[n - 1]])
+        n -= len(idx)
+
+    return len(buf)
+
+def _count_lines(buf, pos):
+    """
+    Return the number of non-blank lines from offset pos to the end of a byte buffer.
+    """
+    return sum(int(np.count_nonzero(nonblank)) for _, nonblank in _iter_lines(buf, pos))
 
 #%%
 class TextObject(DataInterface):
     """
     A class representing a text object to access data in a text file.
 
+    The file is read by the C-level CSV engine of pandas (or pyarrow), so numeric
+    columns come back as numeric dtypes instead of strings. The 'mmap' engine maps
+    numeric files into memory and tokenizes them block by block into one preallocated
+    array, which keeps the peak memory close to the size of the result and allows
+    reading a window of rows from very large files.
+
     Args:
         path (str): The path to the text file.
         name (str, optional): The name of the text object. Defaults to None.
         comment (str, optional): Any additional comment about the text object. Defaults to None.
+        delimiter (str, optional): The column delimiter. Defaults to ','.
+        dtypes (str or dict, optional): A dtype for all columns (e.g. 'float32') or a dict of dtypes per column.
+                                        Defaults to None, which infers the dtypes.
+        usecols (list, optional): The columns to read. Defaults to None, which reads all columns.
+        engine (str, optional): The CSV engine, 'c', 'pyarrow' or 'mmap' (numeric data only). Defaults to 'c'.
     """
 
-    def __init__(self, path, name=None, comment=None, delimiter=','):
+    def __init__(self, path, name=None, comment=None, delimiter=',', dtypes=None, usecols=None, engine='c'):
         
         # Initialize the text interface object, passing the path, name, and comment to the base class.
         super().__init__(path=path, name=name, comment=comment)
         
         # Default delimiter is a comma.
         self.delimiter = delimiter
+        self.dtypes = dtypes
+        self.usecols = usecols
+        self.engine = engine
         
         
     def __repr__(self):
@@ -29,21 +102,146 @@ class TextObject(DataInterface):
     def __str__(self):
         
         return f'{self.name}'
+
+    def cache_params(self):
+
+        usecols = None if self.usecols is None else tuple(self.usecols)
+
+        return (self.delimiter, repr(self.dtypes), usecols, self.engine)
         
-    def get_df(self):
+    def get_df(self, columns=None, rows=None):
         """
         Read the text file and return its contents as a pandas DataFrame.
 
+        Args:
+            columns (list, optional): Read only these columns, missing ones are skipped. Defaults to None.
+            rows (slice, optional): Read only this window of data rows, e.g. slice(1000, 2000). The
+                                    index holds the row numbers. Defaults to None, which reads all rows.
+
         Returns:
             pandas.DataFrame: The contents of the text file as a DataFrame.
         """
-        with open(self.path, 'r') as f:
-            lines = f.readlines()
-       
-        df = pd.DataFrame([l.strip().split(self.delimiter) for l in lines[1:]], 
-                          columns=lines[0].strip().split(self.delimiter))
+        if self.engine == 'mmap':
+            return self._read_mmap(columns, rows)
+        
+        usecols = self.usecols
+        if columns is not None:
+            # read only the header to push the selection down to the parser
+            header = pd.read_csv(self.path, sep=self.delimiter, nrows=0).columns
+            usecols = [c for c in header if c in columns and (self.usecols is None or c in self.usecols)]
         
+        if rows is not None and self.engine == 'c' and rows.step in (None, 1) and \
+           (rows.start or 0) >= 0 and rows.stop is not None and rows.stop >= 0:
+            df = self._read_window(rows.start or 0, rows.stop, usecols)
+        else:
+            df = pd.read_csv(self.path, sep=self.delimiter, dtype=self.dtypes, usecols=usecols, 
+                             engine=self.engine)
+            if rows is not None:
+                df = df.iloc[rows]
+        
+        return self.select_columns(df, columns)
+
+    def iter_chunks(self, chunksize=100000, columns=None):
+        """
+        Iterate over the text file in chunks of rows, holding only one chunk in memory.
+
+        Args:
+            chunksize (int, optional): The number of rows per chunk. Defaults to 100000.
+            columns (list, optional): Read only these columns, missing ones are skipped. Defaults to None.
+
+        Yields:
+            pandas.DataFrame: The consecutive chunks with the row numbers as index.
+        """
+        usecols = self.usecols
+        if columns is not None:
+            header = pd.read_csv(self.path, sep=self.delimiter, nrows=0).columns
+            usecols = [c for c in header if c in columns and (self.usecols is None or c in self.usecols)]
+        
+        # the pyarrow engine cannot read in chunks, the C engine is used for all engines
+        dtypes = np.float64 if self.engine == 'mmap' and self.dtypes is None else self.dtypes
+        with pd.read_csv(self.path, sep=self.delimiter, dtype=dtypes, usecols=usecols, engine='c', 
+                         chunksize=chunksize) as reader:
+            for chunk in reader:
+                yield self.apply_dtype_policy(self.select_columns(chunk, columns))
+
+    def _read_window(self, start, stop, usecols=None):
+        """
+        Read the data rows start to stop with the C engine, seeking to the first row by byte offset.
+        """
+        header = pd.read_csv(self.path, sep=self.delimiter, nrows=0).columns
+        with open(self.path, 'rb') as f:
+            # the skipped rows are neither tokenized nor stored
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                offset = _seek_lines(mm, _seek_lines(mm, 0, 1), start)
+            f.seek(offset)
+            try:
+                df = pd.read_csv(f, sep=self.delimiter, header=None, names=list(header), dtype=self.dtypes, 
+                                 usecols=usecols, engine='c', nrows=max(stop - start, 0))
+            except pd.errors.EmptyDataError:
+                # the window starts after the last row
+                df = pd.DataFrame(columns=[c for c in header if usecols is None or c in usecols])
+        df.index = pd.RangeIndex(start, start + len(df))
+
         return df
+
+    def _read_mmap(self, columns=None, rows=None):
+        """
+        Read numeric data from the memory-mapped file into a preallocated array.
+        """
+        if isinstance(self.dtypes, dict):
+            raise ValueError("The mmap engine reads numeric data of a single dtype, dtypes must not be a dict.")
+        if self.dtypes is None:
+            # a float32 policy is applied while parsing instead of converting a float64 result
+            dtype = np.dtype(np.float32 if 'float32' in dtype_rules(self.dtype_policy) else np.float64)
+        else:
+            dtype = np.dtype(self.dtypes)
+        
+        with open(self.path, 'rb') as f:
+            try:
+                mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                # empty file
+                return pd.DataFrame()
+        
+        with mm:
+            data_start = _seek_lines(mm, 0, 1)
+            names = [c.strip() for c in mm[:data_start].decode().strip().split(self.delimiter)]
+            keep = [i for i, c in enumerate(names) 
+                    if (self.usecols is None or c in self.usecols) and (columns is None or c in columns)]
+            if not keep:
+                return pd.DataFrame()
+            
+            rows = slice(None) if rows is None else rows
+            if (rows.start or 0) < 0 or rows.stop is None or rows.stop < 0:
+                start, stop, step = rows.indices(_count_lines(mm, data_start))
+            else:
+                start, stop, step = rows.start or 0, rows.stop, rows.step or 1
+            
+            n = max(stop - start, 0)
+            pos = _seek_lines(mm, data_start, start)
+            if n > len(mm) - pos:
+                # every row takes at least one byte, clamp a stop beyond the end of the file
+                n = min(n, _count_lines(mm, pos))
+            out = np.empty((n, len(keep)), dtype=dtype)
+            filled = 0
+            while filled < n and pos < len(mm):
+                end = _seek_lines(mm, pos, min(BLOCK_ROWS, n - filled))
+                try:
+                    block = pd.read_csv(io.BytesIO(mm[pos:end]), sep=self.delimiter, header=None, usecols=keep, 
+                                        dtype=dtype, engine='c').to_numpy()
+                except pd.errors.EmptyDataError:
+                    # only blank lines in this block
+                    block = out[:0]
+                out[filled:filled + len(block)] = block
+                filled += len(block)
+                pos = end
+        
+        df = pd.DataFrame(out[:filled], columns=[names[i] for i in keep], 
+                          index=pd.RangeIndex(start, start + filled), copy=False)
+        if step != 1:
+            df = df.iloc[::step]
+        
+        return self.select_columns(df, columns)
     
     def to_excel(self, path):
         """
@@ -1,5 +1,85 @@
+import csv
 import os
 
+from djsurfer.lib_interface.get_data_textreport import DEFAULT_FIELDS, extract_fields
+
+UNIT_MARKER = 'Test Results Report'
+
+def iter_units(input_path, marker=UNIT_MARKER):
+    """
+    Read a text object with many repeating units line by line and yield the text of each unit.
+
+    Only the current unit is held in memory. Like the former split, empty rows and rows
+    beginning with ' ===' are removed and the text before the first marker is dropped.
+
+    Args:
+        input_path: path of source file for text object to be splitted
+        marker (str, optional): the text that starts each unit. Defaults to 'Test Results Report'.
+
+    Yields:
+        str: the cleaned text of each unit, empty if the unit has no content
+    """
+    unit_lines = None
+
+    with open(input_path, "r") as file:
+        for line in file:
+            while marker in line:
+                head, line = line.split(marker, 1)
+                if unit_lines is not None:
+                    _add_line(unit_lines, head)
+                    yield '\n'.join(unit_lines)
+                unit_lines = []
+            if unit_lines is not None:
+                _add_line(unit_lines, line)
+
+    if unit_lines is not None:
+        yield '\n'.join(unit_lines)
+
+def _add_line(unit_lines, line):
+
+    #remove all empty rows and rows beginning with ====
+    if line.strip() and not line.startswith(' ==='):
+        unit_lines.append(line.strip())
+
+def iter_unit_records(input_path, fields=DEFAULT_FIELDS, marker=UNIT_MARKER):
+    """
+    Extract the report fields of every unit of a text object without writing intermediate files.
+
+    Args:
+        input_path: path of source file for text object
+        fields (tuple, optional): Field tuples to extract, see TextReportObject. Defaults to DEFAULT_FIELDS.
+        marker (str, optional): the text that starts each unit. Defaults to 'Test Results Report'.
+
+    Yields:
+        dict: {field name: value} of each non-empty unit
+    """
+    for unit in iter_units(input_path, marker=marker):
+        if unit:
+            yield extract_fields(unit, fields)
+
+def write_unit_table(input_path, output_file, fields=DEFAULT_FIELDS, marker=UNIT_MARKER):
+    """
+    Bulk writer: extract the fields of all units and write them as rows of a single CSV file.
+
+    Args:
+        input_path: path of source file for text object
+        output_file: path of the CSV file to write
+        fields (tuple, optional): Field tuples to extract. Defaults to DEFAULT_FIELDS.
+        marker (str, optional): the text that starts each unit. Defaults to 'Test Results Report'.
+
+    Returns:
+        int: number of units written
+    """
+    n = 0
+    with open(output_file, 'w', newline='') as file:
+        writer = csv.DictWriter(file, fieldnames=[field[0] for field in fields])
+        writer.writeheader()
+        for record in iter_unit_records(input_path, fields=fields, marker=marker):
+            writer.writerow(record)
+            n += 1
+
+    return n
+
 def split_unit_from_textobject(input_path,output_path):
     """
     For text object which has many repeating substructure containing same pattern of text and data, you can
@@ -17,24 +97,16 @@ def split_unit_from_textobject(input_path,output_path):
     input_file_name = os.path.splitext(file_name)[0]
     #print(f'Input file name ist {input_file_name}')
 
-    #open report file
-    with open(input_path, "r") as file:
-        content =file.read()
-
-    #split report text into text blocks
-    units = content.split('Test Results Report')  # units[0] is empty
-
-    for i, unit in enumerate(units[1:]):
-        #remove all empty rows and rows beginning with ====
-        unit_lines = [line.strip() for line in unit.split('\n') if line.strip() and not line.startswith(' ===')]
+    #read the report unit by unit
+    for i, unit in enumerate(iter_units(input_path)):
 
         #write the content of each unit into single file in output_path
-        if unit_lines:
+        if unit:
             #use input file name plus index for output file names to store each single unit
             #linked output path and file name together
-            output_file_name = '{}\{}'.format(output_path, f'{input_file_name}_split_{i+1}.txt')
+            output_file_name = os.path.join(output_path, f'{input_file_name}_split_{i+1}.txt')
             with open(output_file_name,'w') as file:
-                file.write('\n'.join(unit_lines))
+                file.write(unit)
 
     return None
 
@@ -44,4 +116,4 @@ if __name__ == '__main__':
     #input_path = Path(Path.home, 'Documents\\Python Scripts\\PythonProject_DJSurfer','tests\\demo_data\\217312-0128-15_CELL_Testfile.txt')
     input_path = r'C:\Users\yax3si\Documents\Python Scripts\PythonProject_DJSurfer\tests\demo_data\217312-0128-15_CELL_Testfile.txt'
     output_path= Path(r'C:\Users\yax3si\Documents\Python Scripts\PythonProject_DJSurfer\tests\demo_data', "txt_datapool")
-    split_unit_from_textobject(input_path, output_path)
\ No newline at end of file
+    split_unit_from_textobject(input_path, output_path)
@@ -0,0 +1,245 @@
+from collections import namedtuple
+from contextlib import contextmanager
+from functools import wraps
+from threading import Lock, get_ident, local
+import json
+import os
+import time
+import tracemalloc
+
+#%%
+Event = namedtuple('Event', ['stage', 'name', 'seconds', 'nbytes', 'rows', 'cols', 'peak_bytes', 'start', 'thread', 'error'])
+Event.__doc__ = """
+A timed stage of a datapool operation, e.g. parsing one file.
+
+Fields:
+- stage (str): The stage, e.g. 'discover', 'parse', 'disk_cache', 'concat'.
+- name (str): The file or operation the stage worked on.
+- seconds (float): The wall time of the stage.
+- nbytes (int): The size of the source file read, or None.
+- rows, cols (int): The shape of the dataframe produced, or None.
+- peak_bytes (int): The peak memory allocated during the stage if memory is tracked, else None.
+- start (float): The start time on the time.perf_counter clock.
+- thread (int): The identifier of the thread that ran the stage.
+- error (str): The exception raised by the stage, or None.
+"""
+
+_hooks = []
+_state = local()
+# peaks per stage need tracemalloc.reset_peak, which exists from Python 3.9 on
+_PEAKS = hasattr(tracemalloc, 'reset_peak')
+
+def add_hook(hook):
+    """
+    Register a callable that is called with an Event after every instrumented stage.
+
+    Args:
+        hook (callable): The callback, e.g. a Profiler.
+    """
+    _hooks.append(hook)
+
+def remove_hook(hook):
+    """
+    Unregister a callback registered with ``add_hook``.
+
+    Args:
+        hook (callable): The callback.
+    """
+    _hooks.remove(hook)
+
+@contextmanager
+def span(stage, name=None, path=None):
+    """
+    Time a stage and report it to the registered hooks. Without hooks it costs next to nothing.
+
+    The caller may put the dataframe produced under the key 'frame' of the yielded dict
+    to report its shape.
+
+    Args:
+        stage (str): The stage name.
+        name (str, optional): The file or operation name. Defaults to None.
+        path (str, optional): The source file, its size is reported as bytes read. Defaults to None.
+
+    Yields:
+        dict: Information filled in by the caller.
+    """
+    info = {}
+    if not _hooks:
+        yield info
+        return
+
+    tracing = _PEAKS and tracemalloc.is_tracing()
+    if tracing:
+        stack = _state.__dict__.setdefault('stack', [])
+        current, peak = tracemalloc.get_traced_memory()
+        if stack:
+            # keep the peak of the enclosing stage before the counter is reset
+            stack[-1][1] = max(stack[-1][1], peak)
+        stack.append([current, 0])
+        tracemalloc.reset_peak()
+
+    error = None
+    start = time.perf_counter()
+    try:
+        yield info
+    except BaseException as e:
+        error = repr(e)
+        raise
+    finally:
+        seconds = time.perf_counter() - start
+
+        peak_bytes = None
+        if tracing:
+            base, child_peak = stack.pop()
+        if tracing and tracemalloc.is_tracing():
+            peak = max(tracemalloc.get_traced_memory()[1], child_peak)
+            if stack:
+                stack[-1][1] = max(stack[-1][1], peak)
+            peak_bytes = peak - base
+
+        nbytes = None
+        if path is not None:
+            try:
+                nbytes = os.stat(path).st_size
+            except OSError:
+                pass
+
+        frame = info.get('frame')
+        rows, cols = (None, None) if frame is None else frame.shape
+        event = Event(stage, None if name is None else str(name), seconds, nbytes, rows, cols, 
+                      peak_bytes, start, get_ident(), error)
+        for hook in list(_hooks):
+            hook(event)
+
+def traced(stage):
+    """
+    Decorator reporting a method call as a stage named after the object, see ``span``.
+
+    Args:
+        stage (str): The stage name.
+    """
+    def decorator(func):
+        @wraps(func)
+        def wrapper(self, *args, **kwargs):
+            if not _hooks:
+                return func(self, *args, **kwargs)
+            with span(stage, getattr(self, 'root', None) or getattr(self, 'path', None)) as info:
+                out = func(self, *args, **kwargs)
+                if hasattr(out, 'shape') and len(out.shape) == 2:
+                    info['frame'] = out
+            return out
+        return wrapper
+
+    return decorator
+
+#%%
+class Profiler(object):
+    """
+    A hook collecting the events of instrumented stages, exportable as a table or a trace file.
+
+    Use it with ``profile``, or register it with ``add_hook``. Memory tracking uses tracemalloc,
+    which slows Python down noticeably and attributes memory of all threads to the running
+    stages. Stages run in worker processes (executor='process') are only seen as a whole.
+
+    Args:
+        track_memory (bool, optional): Record the peak memory of each stage, requires Python 3.9 or later.
+                                       Defaults to False.
+    """
+
+    def __init__(self, track_memory=False):
+
+        self.track_memory = track_memory
+        self.events = []
+        self._lock = Lock()
+
+    def __repr__(self):
+
+        return f'{self.__class__.__name__}({len(self.events)} events)'
+
+    def __call__(self, event):
+
+        with self._lock:
+            self.events.append(event)
+
+    def table(self):
+        """
+        Returns all events as a table, one row per stage run.
+
+        Returns:
+            pandas.DataFrame: The columns are the fields of Event.
+        """
+        import pandas as pd
+
+        return pd.DataFrame(self.events, columns=Event._fields)
+
+    def summary(self):
+        """
+        Returns the events aggregated by stage.
+
+        Returns:
+            pandas.DataFrame: count, total, mean and max seconds, bytes, rows and the maximum peak memory per stage.
+        """
+        table = self.table()
+
+        return table.groupby('stage', sort=False).agg(count=('seconds', 'size'), seconds=('seconds', 'sum'),
+                                                      mean_seconds=('seconds', 'mean'), max_seconds=('seconds', 'max'),
+                                                      nbytes=('nbytes', 'sum'), rows=('rows', 'sum'),
+                                                      peak_bytes=('peak_bytes', 'max'), errors=('error', 'count'))
+
+    def slowest(self, n=10, stage='parse'):
+        """
+        Returns the slowest runs of a stage, e.g. the pathological files of a pool.
+
+        Args:
+            n (int, optional): The number of events. Defaults to 10.
+            stage (str, optional): The stage. Defaults to 'parse'.
+
+        Returns:
+            pandas.DataFrame: The n slowest events of the stage.
+        """
+        table = self.table()
+
+        return table[table['stage'] == stage].nlargest(n, 'seconds')
+
+    def save_trace(self, path):
+        """
+        Write the events in the Chrome trace event format, viewable in chrome://tracing or Perfetto.
+
+        Args:
+            path (str): The JSON file to write.
+        """
+        events = []
+        for e in self.events:
+            args = {k: v for k, v in e._asdict().items() if k in ('nbytes', 'rows', 'cols', 'peak_bytes', 'error') and v is not None}
+            events.append({'name': e.name or e.stage, 'cat': e.stage, 'ph': 'X', 'ts': e.start * 1e6, 
+                           'dur': e.seconds * 1e6, 'pid': os.getpid(), 'tid': e.thread, 'args': args})
+        with open(path, 'w') as f:
+            json.dump({'traceEvents': events, 'displayTimeUnit': 'ms'}, f)
+
+@contextmanager
+def profile(track_memory=False):
+    """
+    Collect the events of all instrumented stages run in the block.
+
+    Example:
+        with profile() as prof:
+            DataPool(path, interface=TextObject).load(workers=4)
+        print(prof.summary())
+
+    Args:
+        track_memory (bool, optional): Record the peak memory of each stage. Defaults to False.
+
+    Yields:
+        Profiler: The profiler collecting the events.
+    """
+    profiler = Profiler(track_memory=track_memory)
+    started = track_memory and _PEAKS and not tracemalloc.is_tracing()
+    if started:
+        tracemalloc.start()
+    add_hook(profiler)
+    try:
+        yield profiler
+    finally:
+        remove_hook(profiler)
+        if started:
+            tracemalloc.stop()
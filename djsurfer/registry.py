@@ -0,0 +1,140 @@
+from collections import namedtuple
+import os
+import re
+
+#%%
+# A dispatch rule: all given criteria must match for the interface to be chosen.
+Rule = namedtuple('Rule', ['interface', 'ftype', 'pattern', 'sniff', 'priority'])
+
+SNIFF_BYTES = 4096
+
+def _head(path, n=SNIFF_BYTES):
+    """
+    Returns the first n bytes of a file, empty if it cannot be read.
+    """
+    try:
+        with open(path, 'rb') as f:
+            return f.read(n)
+    except OSError:
+        return b''
+
+class Registry(object):
+    """
+    Map files to DataInterface subclasses by extension, file name regex and content sniffers.
+
+    A Registry can be passed as ``interface`` to DataPool, which then walks the directory
+    once and creates each file with the interface of the first matching rule. Rules are
+    tried by descending priority, and in registration order for equal priorities. A
+    sniffer is called with the first bytes of the file, which are only read if a rule
+    with a sniffer is reached.
+    """
+
+    def __init__(self):
+
+        self.rules = []
+
+    def __repr__(self):
+
+        return f'{self.__class__.__name__}({[rule.interface.__name__ for rule in self.rules]})'
+
+    def register(self, interface, ftype=None, pattern=None, sniff=None, priority=0):
+        """
+        Add a dispatch rule.
+
+        Args:
+            interface (class): The DataInterface subclass to create the matching files with.
+            ftype (str or tuple, optional): Required file name ending(s), compared case-insensitively. Defaults to None.
+            pattern (str, optional): A regular expression searched in the file name. Defaults to None.
+            sniff (callable, optional): Called with the first bytes of the file, returns True if it matches. Defaults to None.
+            priority (int, optional): Rules with higher priority are tried first. Defaults to 0.
+
+        Returns:
+            class: The interface.
+        """
+        if isinstance(ftype, str):
+            ftype = (ftype,)
+        ftype = None if ftype is None else tuple(f.lower() for f in ftype)
+        pattern = None if pattern is None else re.compile(pattern)
+
+        self.rules.append(Rule(interface, ftype, pattern, sniff, priority))
+        self.rules.sort(key=lambda rule: -rule.priority)
+
+        return interface
+
+    def resolve(self, path):
+        """
+        Returns the interface for a file.
+
+        Args:
+            path (str): The path of the file.
+
+        Returns:
+            class: The interface of the first matching rule, or None if no rule matches.
+        """
+        filename = os.path.basename(path)
+        lower = filename.lower()
+        head = None
+
+        for rule in self.rules:
+            if rule.ftype is not None and not lower.endswith(rule.ftype):
+                continue
+            if rule.pattern is not None and not rule.pattern.search(filename):
+                continue
+            if rule.sniff is not None:
+                if head is None:
+                    head = _head(path)
+                if not rule.sniff(head):
+                    continue
+            return rule.interface
+
+        return None
+
+    def dispatch(self, paths):
+        """
+        Resolve the interfaces of many files.
+
+        Args:
+            paths (list): The paths of the files.
+
+        Returns:
+            dict: {path: interface} of the files that match a rule, in the order of paths.
+        """
+        out = {}
+        for path in paths:
+            interface = self.resolve(path)
+            if interface is not None:
+                out[path] = interface
+
+        return out
+
+def _is_report(head):
+    """
+    Sniff an ICT report by its fields, the splitter removes the 'Test Results Report' marker.
+    """
+    return b'File Name:' in head and b'Failures:' in head
+
+#%%
+def default_registry():
+    """
+    Returns a registry of the interfaces of djsurfer.
+
+    - MeasTextObject_SY: '.txt' files named 'Kr_*'
+    - TextReportObject: '.txt' ICT reports, also the unit files written by split_unit_from_textobject
+    - D97_Object: '.zip' and '.d97' files
+    - TextObject: any other '.txt' or '.csv' file
+
+    Returns:
+        Registry: A new registry, rules can be added to it.
+    """
+    from djsurfer.lib_interface.text_object import TextObject
+    from djsurfer.lib_interface.d97_object import D97_Object
+    from djsurfer.lib_interface.meas_object_SY import MeasTextObject_SY
+    from djsurfer.lib_interface.get_data_textreport import TextReportObject
+
+    registry = Registry()
+    registry.register(MeasTextObject_SY, ftype='.txt', pattern=r'^Kr_', priority=10)
+    registry.register(TextReportObject, ftype='.txt', sniff=_is_report, priority=10)
+    registry.register(D97_Object, ftype=('.zip', '.d97'))
+    registry.register(TextObject, ftype=('.txt', '.csv'), priority=-10)
+
+    return registry
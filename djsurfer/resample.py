@@ -0,0 +1,106 @@
+import numpy as np
+
+#%%
+METHODS = ('nearest', 'linear', 'ffill')
+
+def make_grid(spans, freq):
+    """
+    Build a regular time grid covering all given time spans.
+
+    Args:
+        spans (list): (start, end) tuples of the time ranges to cover.
+        freq (float): The step of the grid.
+
+    Returns:
+        numpy.ndarray: The grid points from the earliest start to the latest end.
+    """
+    if freq <= 0:
+        raise ValueError(f"The grid step must be positive, got {freq}.")
+    if len(spans) == 0:
+        return np.empty(0)
+
+    start = min(s for s, _ in spans)
+    end = max(e for _, e in spans)
+    n = int(np.floor((end - start) / freq + 1e-9)) + 1
+
+    return start + np.arange(n) * freq
+
+def resample(t, v, grid, method='nearest'):
+    """
+    Resample a signal onto a grid with vectorized NumPy operations.
+
+    Grid points outside the time range of the signal are NaN, signals are not extrapolated.
+
+    Args:
+        t (array-like): The time stamps of the signal.
+        v (array-like): The values of the signal.
+        grid (array-like): The time stamps to resample to.
+        method (str, optional): 'nearest', 'linear' or 'ffill'. Defaults to 'nearest'.
+
+    Returns:
+        numpy.ndarray: The float values of the signal on the grid.
+    """
+    if method not in METHODS:
+        raise ValueError(f"Unknown resample method '{method}', expected one of {METHODS}.")
+
+    t = np.asarray(t, dtype=float)
+    v = np.asarray(v, dtype=float)
+    grid = np.asarray(grid, dtype=float)
+    out = np.full(grid.shape, np.nan)
+
+    valid = ~np.isnan(t)
+    t, v = t[valid], v[valid]
+    if len(t) == 0:
+        return out
+    if np.any(np.diff(t) < 0):
+        order = np.argsort(t, kind='stable')
+        t, v = t[order], v[order]
+
+    inside = (grid >= t[0]) & (grid <= t[-1])
+    g = grid[inside]
+
+    if method == 'linear':
+        out[inside] = np.interp(g, t, v)
+    elif method == 'ffill':
+        out[inside] = v[np.searchsorted(t, g, side='right') - 1]
+    else:
+        right = np.clip(np.searchsorted(t, g, side='left'), 0, len(t) - 1)
+        left = np.clip(right - 1, 0, len(t) - 1)
+        closer_left = np.abs(g - t[left]) <= np.abs(t[right] - g)
+        out[inside] = v[np.where(closer_left, left, right)]
+
+    return out
+
+def merge_ffill(signals):
+    """
+    Merge signals with different sampling rates onto the union of their time stamps.
+
+    The union axis is built once, then every signal is forward filled onto it with
+    np.searchsorted. Values before the first sample of a signal are back filled with
+    its first value. If a signal has several samples on one time stamp, the last one wins.
+
+    Args:
+        signals (dict): {name: (timestamps, values)} of the signals to merge.
+
+    Returns:
+        tuple: (union time stamps as numpy.ndarray, {name: values on the union axis})
+    """
+    stamps = [np.asarray(t) for t, _ in signals.values()]
+    if len(stamps) == 0:
+        return np.empty(0), {}
+    union = np.unique(np.concatenate(stamps))
+
+    merged = {}
+    for name, (t, v) in signals.items():
+        t = np.asarray(t)
+        v = np.asarray(v)
+        if len(t) == 0:
+            merged[name] = np.full(len(union), np.nan)
+            continue
+        if np.any(np.diff(t) < 0):
+            order = np.argsort(t, kind='stable')
+            t, v = t[order], v[order]
+        idx = np.searchsorted(t, union, side='right') - 1
+        merged[name] = v[np.clip(idx, 0, len(t) - 1)]
+
+    return union, merged
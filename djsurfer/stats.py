@@ -0,0 +1,199 @@
+import json
+import os
+
+import numpy as np
+
+#%%
+class RunningStats(object):
+    """
+    Accumulate count, minimum, maximum and sum of a signal chunk by chunk.
+
+    NaN values are ignored. Two accumulators can be combined with ``merge``, so
+    statistics of single files can be reduced to pool-wide statistics.
+    """
+
+    def __init__(self):
+
+        self.count = 0
+        self.min = np.nan
+        self.max = np.nan
+        self.sum = 0.0
+
+    def __repr__(self):
+
+        return f'{self.__class__.__name__}(count={self.count}, min={self.min}, max={self.max}, mean={self.mean})'
+
+    @property
+    def mean(self):
+
+        return self.sum / self.count if self.count else np.nan
+
+    def update(self, values):
+        """
+        Add a chunk of values.
+
+        Args:
+            values (array-like): The values to add.
+
+        Returns:
+            RunningStats: self, to allow chaining.
+        """
+        values = np.asarray(values, dtype=float)
+        values = values[~np.isnan(values)]
+        if len(values) == 0:
+            return self
+
+        self.min = np.nanmin([self.min, values.min()])
+        self.max = np.nanmax([self.max, values.max()])
+        self.sum += float(values.sum())
+        self.count += len(values)
+
+        return self
+
+    def merge(self, other):
+        """
+        Add the values of another accumulator.
+
+        Args:
+            other (RunningStats): The accumulator to add.
+
+        Returns:
+            RunningStats: self, to allow chaining.
+        """
+        if other.count:
+            self.min = np.nanmin([self.min, other.min])
+            self.max = np.nanmax([self.max, other.max])
+            self.sum += other.sum
+            self.count += other.count
+
+        return self
+
+    def to_dict(self):
+        """
+        Returns the statistics as a dictionary with the keys count, min, max and mean.
+        """
+        return {'count': self.count, 'min': float(self.min), 'max': float(self.max), 'mean': float(self.mean)}
+
+#%%
+STATS = ('count', 'min', 'max', 'mean')
+
+class StatsIndex(object):
+    """
+    A persisted summary of the signals of each file: count, min, max and mean per signal
+    and the time span of the file.
+
+    Entries are stored with the cache key of the source, so an entry is only recomputed
+    if the file or the interface parameters changed.
+
+    Args:
+        path (str, optional): The JSON file to persist the index in. Defaults to None, which keeps it in memory.
+    """
+
+    def __init__(self, path=None):
+
+        self.path = path
+        self.entries = {}
+        if path is not None and os.path.isfile(path):
+            with open(path, 'r') as f:
+                self.entries = json.load(f)
+
+    def __repr__(self):
+
+        return f'{self.__class__.__name__}("{self.path}", {len(self.entries)} files)'
+
+    def __len__(self):
+
+        return len(self.entries)
+
+    def get(self, path, key, names=None):
+        """
+        Returns the entry of a file if it is up to date and covers the signals.
+
+        Args:
+            path (str): The path of the file.
+            key (tuple): The current cache key of the file.
+            names (list, optional): The signals the entry must cover. Defaults to None, which means all signals.
+
+        Returns:
+            dict: The entry with the keys 'names', 'span' and 'signals', or None.
+        """
+        entry = self.entries.get(str(path))
+        if entry is None or entry['key'] != repr(key):
+            return None
+        if entry['names'] is not None and (names is None or not set(names) <= set(entry['names'])):
+            return None
+
+        return entry
+
+    def put(self, path, key, names, signals, span=None):
+        """
+        Store the statistics of a file.
+
+        Args:
+            path (str): The path of the file.
+            key (tuple): The cache key the statistics were computed for.
+            names (list): The signals that were requested, None for all signals.
+            signals (dict): {signal: RunningStats} of the signals found in the file.
+            span (tuple, optional): (start, end) of the time base. Defaults to None.
+        """
+        self.entries[str(path)] = {'key': repr(key), 
+                                   'names': None if names is None else list(names),
+                                   'span': None if span is None else [float(span[0]), float(span[1])],
+                                   'signals': {name: s.to_dict() for name, s in signals.items()}}
+
+    def prune(self, paths):
+        """
+        Remove the entries of files that are not in paths.
+
+        Args:
+            paths (list): The paths to keep.
+
+        Returns:
+            bool: True if entries were removed.
+        """
+        keep = set(str(p) for p in paths)
+        removed = [p for p in self.entries if p not in keep]
+        for p in removed:
+            del self.entries[p]
+
+        return len(removed) > 0
+
+    def save(self):
+        """
+        Write the index to its JSON file.
+        """
+        tmp = f'{self.path}.tmp'
+        with open(tmp, 'w') as f:
+            json.dump(self.entries, f)
+        os.replace(tmp, self.path)
+
+    def table(self, paths=None):
+        """
+        Returns the index as a wide table with one row per file.
+
+        Args:
+            paths (list, optional): The files to include, in this order. Defaults to None, which includes all.
+
+        Returns:
+            pandas.DataFrame: Indexed by path with the columns 'start' and 'end' of the time span
+                              and '<signal>.<stat>' for the statistics and '<signal>.present'.
+        """
+        import pandas as pd
+
+        paths = list(self.entries) if paths is None else [str(p) for p in paths if str(p) in self.entries]
+        names = sorted({name for p in paths for name in self.entries[p]['signals']})
+
+        data = {'start': [], 'end': []}
+        data.update({f'{name}.{stat}': [] for name in names for stat in STATS + ('present',)})
+        for p in paths:
+            entry = self.entries[p]
+            span = entry['span'] or [np.nan, np.nan]
+            data['start'].append(span[0])
+            data['end'].append(span[1])
+            for name in names:
+                s = entry['signals'].get(name)
+                for stat in STATS:
+                    data[f'{name}.{stat}'].append(np.nan if s is None else s[stat])
+                data[f'{name}.present'].append(s is not None)
+
+        return pd.DataFrame(data, index=pd.Index(paths, name='path'))
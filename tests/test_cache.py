@@ -0,0 +1,124 @@
+#!/usr/bin/env python
+
+"""Tests for the dataframe cache of `djsurfer` interfaces."""
+import os
+import pytest
+import numpy as np
+import pandas as pd
+
+from djsurfer.cache import FrameCache, frame_nbytes
+from djsurfer.lib_interface.text_object import TextObject
+
+#%%
+def test_framecache_lru_eviction():
+
+    dfs = [pd.DataFrame(np.zeros((100, 2))) for _ in range(3)]
+    cache = FrameCache(max_bytes=2 * frame_nbytes(dfs[0]))
+
+    cache.put('a', dfs[0])
+    cache.put('b', dfs[1])
+    cache.get('a')
+    cache.put('c', dfs[2])
+
+    assert 'a' in cache and 'c' in cache
+    assert 'b' not in cache
+    assert cache.nbytes == 2 * frame_nbytes(dfs[0])
+
+#%%
+def test_textobject_dataframe_cached(tmp_path):
+
+    path = tmp_path / 'data.txt'
+    pd.DataFrame({'a': [1, 2], 'b': [3, 4]}).to_csv(path, index=False)
+
+    obj = TextObject(path)
+    obj.cache = FrameCache()
+
+    assert obj.dataframe is obj.dataframe
+    assert len(obj.cache) == 1
+
+    df = obj.dataframe
+    assert obj.refresh() is not df
+
+#%%
+def test_textobject_cache_invalidated_on_change(tmp_path):
+
+    path = tmp_path / 'data.txt'
+    pd.DataFrame({'a': [1, 2]}).to_csv(path, index=False)
+
+    obj = TextObject(path)
+    obj.cache = FrameCache()
+    assert len(obj.dataframe) == 2
+
+    pd.DataFrame({'a': [1, 2, 3]}).to_csv(path, index=False)
+    st = os.stat(path)
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+
+    assert len(obj.dataframe) == 3
+    assert len(obj.cache) == 1
+
+#%%
+def test_diskcache_roundtrip(tmp_path):
+
+    pytest.importorskip('pyarrow')
+    from djsurfer.cache import DiskCache
+
+    path = tmp_path / 'data.txt'
+    pd.DataFrame({'a': [1, 2], 'b': [3, 4]}).to_csv(path, index=False)
+
+    obj = TextObject(path)
+    obj.cache = FrameCache()
+    obj.disk_cache = DiskCache(tmp_path / 'cache')
+    df = obj.dataframe
+
+    assert len(list((tmp_path / 'cache').glob('*.feather'))) == 1
+
+    other = TextObject(path)
+    other.cache = FrameCache()
+    other.disk_cache = obj.disk_cache
+    other.get_df = None  # the source must not be parsed again
+
+    pd.testing.assert_frame_equal(other.dataframe, df)
+
+#%%
+def test_diskcache_column_selection(tmp_path):
+
+    pytest.importorskip('pyarrow')
+    from djsurfer.cache import DiskCache
+
+    cache = DiskCache(tmp_path)
+    df = pd.DataFrame({'a': [1.0, 2.0], 'b': [3.0, 4.0]}, index=pd.Index([10, 20], name='t'))
+    key = ('TextObject', 'x.txt', (), 1, 2)
+    cache.put(key, df)
+
+    out = cache.get(key, columns=['b'])
+    assert list(out.columns) == ['b']
+    assert list(out.index) == [10, 20]
+    assert cache.get(key, columns=['b', 'missing']) is None
+    assert cache.get(key[:-1] + (3,)) is None
+
+#%%
+def test_diskcache_multiindex_columns(tmp_path):
+
+    pytest.importorskip('pyarrow')
+    from djsurfer.cache import DiskCache
+    from djsurfer.lib_interface.meas_object_SY import MeasTextObject_SY
+
+    path = tmp_path / 'run1' / 'Kr_44H7FR_Z65.txt'
+    path.parent.mkdir()
+    angle = np.deg2rad(np.arange(380))
+    path.write_text(''.join(f'{22 * np.cos(a):.5f} {22 * np.sin(a):.5f} -65.000\n' for a in angle))
+
+    obj = MeasTextObject_SY(path)
+    obj.cache = FrameCache()
+    obj.disk_cache = DiskCache(tmp_path / 'cache')
+    parsed = obj.load(columns=['radius'])
+    df = obj.dataframe
+
+    other = MeasTextObject_SY(path)
+    other.cache = FrameCache()
+    other.disk_cache = obj.disk_cache
+    other.get_df = None  # the source must not be parsed again
+
+    out = other.load(columns=['radius'])
+    assert out.shape == parsed.shape == (380, 1)
+    pd.testing.assert_frame_equal(out, df.loc[:, out.columns])
@@ -0,0 +1,86 @@
+#!/usr/bin/env python
+
+"""Tests for the D97 interface of `djsurfer` with a stubbed d97parser."""
+import sys
+import types
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from djsurfer.cache import FrameCache
+
+#%%
+TimeSeries = namedtuple('TimeSeries', ['timestamps', 'values'])
+
+SIGNALS = {
+    'p_MC_Model': TimeSeries(np.array([0.0, 0.01, 0.02]), np.array([1.0, 2.0, 3.0])),
+    'RBMESG_RB_VirtualPressureSensor': TimeSeries(np.array([0.0, 0.02]), np.array([5.0, 6.0])),
+    'other': TimeSeries(np.array([0.01]), np.array([9.0])),
+}
+
+@pytest.fixture
+def d97_file(tmp_path, monkeypatch):
+
+    def load_signals(measurement_filepath, add_signal_names):
+        return {name: SIGNALS[name] for name in add_signal_names if name in SIGNALS}
+
+    package = types.ModuleType('d97parser')
+    package.d97parser = types.SimpleNamespace(load_signals=load_signals)
+    monkeypatch.setitem(sys.modules, 'd97parser', package)
+
+    path = tmp_path / 'run.zip'
+    path.write_bytes(b'PK')
+
+    return path
+
+#%%
+def test_d97_selection_beyond_relevant_signals(d97_file):
+
+    from djsurfer.lib_interface.d97_object import D97_Object
+
+    obj = D97_Object(d97_file)
+    obj.cache = FrameCache()
+
+    assert sorted(obj.dataframe.columns) == ['RBMESG_RB_VirtualPressureSensor', 'p_MC_Model', 'time']
+    assert list(obj.load(columns=['p_MC_Model']).columns) == ['p_MC_Model']
+
+    df = obj.load(columns=['other', 'time'])
+    assert list(df.columns) == ['other', 'time']
+    assert df['other'].tolist() == [9.0]
+
+#%%
+def test_d97_pool_signal_with_disk_cache(d97_file, tmp_path):
+
+    pytest.importorskip('pyarrow')
+    from djsurfer.datapool import DataPool
+    from djsurfer.lib_interface.d97_object import D97_Object
+
+    dp = DataPool(tmp_path, interface=D97_Object, ftype='.zip', cache_bytes=2**20, cache_dir=tmp_path / 'cache')
+    dp.objs[0].dataframe
+    dp.cache.clear()  # served from the disk cache from now on
+
+    out = dp.get_signal('other', time_base='time')
+    assert out['run'].tolist() == [9.0]
+
+#%%
+def test_d97_export_from_cache(d97_file, tmp_path):
+
+    from djsurfer.lib_interface.d97_object import D97_Object
+
+    cache = FrameCache()
+    first = D97_Object(d97_file)
+    first.cache = cache
+    first.load(columns=['p_MC_Model'])
+    first.dataframe
+
+    # the second object is served from the cache and never parses the file itself
+    second = D97_Object(d97_file)
+    second.cache = cache
+    second.load(columns=['other', 'time'])
+    second.to_csv(tmp_path / 'run.csv')
+
+    df = pd.read_csv(tmp_path / 'run.csv')
+    assert sorted(df.columns) == ['RBMESG_RB_VirtualPressureSensor', 'p_MC_Model', 'time']
+    assert df['p_MC_Model'].tolist() == [1.0, 2.0, 3.0]
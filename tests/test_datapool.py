@@ -66,3 +66,299 @@ def test_datapool_get_signal(dir_data):
     signal = dp.get_signal('col_5')
     
     assert signal.shape == (120, 2)
+
+#%%
+@pytest.mark.parametrize('executor', ['thread', 'process'])
+def test_datapool_load(tmp_path, executor):
+    
+    from djsurfer.datapool import DataPool
+    from djsurfer.lib_interface.text_object import TextObject
+    
+    for i in range(4):
+        pd.DataFrame({'a': range(i + 1)}).to_csv(tmp_path / f'data{i}.txt', index=False)
+    (tmp_path / 'broken.txt').write_bytes(b'\xff\xfe\x00')
+    
+    dp = DataPool(tmp_path, interface=TextObject, ftype='.txt', cache_bytes=2**20)
+    frames = dp.load(workers=2, executor=executor)
+    
+    assert len(frames) == len(dp.objs) == 5
+    assert [obj.name for obj in dp.objs] == ['broken'] + [f'data{i}' for i in range(4)]
+    assert list(dp.errors) == [str(tmp_path / 'broken.txt')]
+    for obj, df in zip(dp.objs, frames):
+        if obj.name != 'broken':
+            assert len(df) == int(obj.name[-1]) + 1
+            assert obj.dataframe is df
+
+#%%
+def test_textobject_numeric_dtypes(dir_data):
+    
+    from djsurfer.lib_interface.text_object import TextObject
+    
+    path = Path(dir_data) / 'data0.txt'
+    
+    df = TextObject(path).get_df()
+    assert (df.dtypes == np.float64).all()
+    
+    df = TextObject(path, dtypes='float32', usecols=['col_0', 'col_1']).get_df()
+    assert list(df.columns) == ['col_0', 'col_1']
+    assert (df.dtypes == np.float32).all()
+
+#%%
+def test_textobject_column_pushdown(dir_data):
+    
+    from djsurfer.lib_interface.text_object import TextObject
+    
+    obj = TextObject(Path(dir_data) / 'data1.txt')
+    obj.invalidate()
+    
+    df = obj.load(columns=['col_7', 'missing', 'col_5'])
+    assert list(df.columns) == ['col_7', 'col_5']
+    assert len(df) == 120
+
+#%%
+def test_datapool_get_signals(dir_data):
+    
+    from djsurfer.datapool import DataPool
+    from djsurfer.lib_interface.text_object import TextObject
+    
+    dp = DataPool(dir_data, interface=TextObject)
+    
+    wide = dp.get_signals(['col_11', 'col_0'])
+    assert wide.shape == (120, 4)
+    assert list(wide.columns.names) == ['file', 'signal']
+    assert wide[('data0', 'col_11')].isna().all()
+    
+    long = dp.get_signals(['col_11', 'col_0'], how='long')
+    assert list(long.columns) == ['file', 'index', 'signal', 'value']
+    assert len(long) == 100 + 120
+    assert set(long['signal']) == {'col_0', 'col_11'}
+
+#%%
+def test_datapool_lazy_streaming(dir_data):
+    
+    from djsurfer.datapool import DataPool
+    from djsurfer.lib_interface.text_object import TextObject
+    
+    dp = DataPool(dir_data, interface=TextObject, lazy=True, cache_bytes=2**20)
+    
+    assert [name for name, _ in dp.iter_frames()] == ['data0', 'data1']
+    assert [name for name, _ in dp.iter_signal('col_0')] == ['data0']
+    assert dp._objs is None and len(dp.cache) == 0
+    
+    n = dp.map_reduce(len, lambda a, b: a + b)
+    assert n == 220
+    
+    vmax = dp.map_reduce(lambda df: df['col_5'].max(), max, columns=['col_5'])
+    assert vmax <= 1
+
+#%%
+def test_datapool_get_signal_resampled(tmp_path):
+    
+    from djsurfer.datapool import DataPool
+    from djsurfer.lib_interface.text_object import TextObject
+    
+    pd.DataFrame({'time': np.arange(0, 1.001, 0.001), 'p': np.arange(1001.0)}).to_csv(tmp_path / 'fast.txt', index=False)
+    pd.DataFrame({'time': np.arange(0, 2.01, 0.1), 'p': np.arange(21.0)}).to_csv(tmp_path / 'slow.txt', index=False)
+    
+    dp = DataPool(tmp_path, interface=TextObject)
+    
+    out = dp.get_signal('p', time_base='time', freq=0.5, method='linear')
+    assert out.shape == (5, 2)
+    assert list(out.columns) == ['fast', 'slow']
+    np.testing.assert_allclose(out['slow'], [0, 5, 10, 15, 20])
+    np.testing.assert_allclose(out['fast'].iloc[:3], [0, 500, 1000])
+    assert out['fast'].iloc[3:].isna().all()
+    
+    out = dp.get_signal('p', time_base='time', grid=[0.049, 0.26], method='ffill')
+    np.testing.assert_allclose(out['slow'], [0, 2])
+    out = dp.get_signal('p', time_base='time', grid=[0.049, 0.26], method='nearest')
+    np.testing.assert_allclose(out['slow'], [0, 3])
+
+#%%
+def test_textobject_mmap_rows(dir_data, monkeypatch):
+    
+    from djsurfer.lib_interface import text_object
+    from djsurfer.lib_interface.text_object import TextObject
+    
+    # small blocks to cross block boundaries with the demo data
+    monkeypatch.setattr(text_object, 'BLOCK_BYTES', 64)
+    monkeypatch.setattr(text_object, 'BLOCK_ROWS', 7)
+    
+    path = Path(dir_data) / 'data0.txt'
+    ref = TextObject(path).get_df()
+    
+    df = TextObject(path, engine='mmap').get_df()
+    pd.testing.assert_frame_equal(df, ref)
+    
+    for rows in [slice(10, 35), slice(90, 200), slice(-5, None), slice(0, 100, 3)]:
+        df = TextObject(path, engine='mmap', dtypes='float32').get_df(columns=['col_3', 'col_1'], rows=rows)
+        assert list(df.columns) == ['col_3', 'col_1']
+        assert df['col_1'].dtype == np.float32
+        np.testing.assert_allclose(df, ref[['col_3', 'col_1']].iloc[rows], rtol=1e-6)
+        assert list(df.index) == list(ref.index[rows])
+        
+        df = TextObject(path).get_df(rows=rows)
+        pd.testing.assert_frame_equal(df, ref.iloc[rows])
+
+#%%
+def test_datapool_chunked_reductions(dir_data):
+    
+    from djsurfer.datapool import DataPool
+    from djsurfer.lib_interface.text_object import TextObject
+    
+    dp = DataPool(dir_data, interface=TextObject, lazy=True)
+    ref = {name: df for name, df in dp.iter_frames()}
+    
+    chunks = [(name, len(chunk)) for name, chunk in dp.iter_chunks(chunksize=30)]
+    assert chunks == [('data0', 30)] * 3 + [('data0', 10)] + [('data1', 30)] * 4
+    
+    summary = dp.summarize(['col_5', 'col_0'], chunksize=30)
+    assert list(zip(summary['file'], summary['signal'])) == [('data0', 'col_5'), ('data0', 'col_0'), ('data1', 'col_5')]
+    row = summary.iloc[2]
+    assert row['count'] == 120
+    np.testing.assert_allclose([row['min'], row['max'], row['mean']], 
+                               ref['data1']['col_5'].agg(['min', 'max', 'mean']))
+    
+    counts, edges = dp.histogram('col_5', bins=4, chunksize=30)
+    values = pd.concat([ref['data0']['col_5'], ref['data1']['col_5']])
+    expected, expected_edges = np.histogram(values, bins=4)
+    np.testing.assert_array_equal(counts, expected)
+    np.testing.assert_allclose(edges, expected_edges)
+
+#%%
+def test_datapool_query_stats(tmp_path):
+    
+    from djsurfer.datapool import DataPool
+    from djsurfer.lib_interface.text_object import TextObject
+    
+    t = np.arange(0, 10.0, 0.5)
+    pd.DataFrame({'time': t, 'p_MC_Model': 10 * t}).to_csv(tmp_path / 'low.txt', index=False)
+    pd.DataFrame({'time': t + 5, 'p_MC_Model': 20 * t}).to_csv(tmp_path / 'high.txt', index=False)
+    pd.DataFrame({'time': t, 'other': t}).to_csv(tmp_path / 'none.txt', index=False)
+    stats_file = tmp_path / 'stats.json'
+    
+    dp = DataPool(tmp_path, interface=TextObject, ftype='.txt', stats_file=stats_file)
+    
+    assert dp.query('p_MC_Model.max > 150') == [str(tmp_path / 'high.txt')]
+    assert dp.query('not p_MC_Model.present') == [str(tmp_path / 'none.txt')]
+    assert dp.query('start >= 5 or missing.max > 0') == [str(tmp_path / 'high.txt')]
+    assert stats_file.is_file()
+    
+    table = dp.stats_table()
+    assert table.loc[str(tmp_path / 'low.txt'), 'p_MC_Model.count'] == len(t)
+    assert table.loc[str(tmp_path / 'low.txt'), 'end'] == 9.5
+    
+    # a new pool reuses the persisted statistics and only reads changed files
+    pd.DataFrame({'time': t, 'p_MC_Model': 30 * t}).to_csv(tmp_path / 'low.txt', index=False)
+    dp = DataPool(tmp_path, interface=TextObject, ftype='.txt', stats_file=stats_file)
+    assert dp.update_stats() == 1
+    assert dp.query('p_MC_Model.max > 150') == [str(tmp_path / 'high.txt'), str(tmp_path / 'low.txt')]
+
+#%%
+def test_datapool_async_latency(tmp_path):
+    
+    import asyncio
+    import time
+    from djsurfer.datapool import DataPool
+    from djsurfer.lib_interface.text_object import TextObject
+    
+    class SlowTextObject(TextObject):
+        # artificial latency of a network share on stat and read
+        latency = 0.05
+        
+        def cache_key(self):
+            time.sleep(self.latency)
+            return super().cache_key()
+        
+        def get_df(self, columns=None, rows=None):
+            time.sleep(self.latency)
+            return super().get_df(columns=columns, rows=rows)
+    
+    n = 20
+    for i in range(n):
+        pd.DataFrame({'a': np.arange(5.0) + i}).to_csv(tmp_path / f'data{i:02d}.txt', index=False)
+    (tmp_path / 'data99.txt').write_text('a\n"')
+    sequential = (n + 1) * 2 * SlowTextObject.latency
+    
+    dp = DataPool(tmp_path, interface=SlowTextObject, cache_bytes=2**20)
+    t0 = time.perf_counter()
+    frames = asyncio.run(dp.aload(concurrency=n))
+    assert time.perf_counter() - t0 < sequential / 3
+    assert [df['a'].iloc[0] for df in frames[:n]] == list(range(n))
+    assert frames[n] is None and list(dp.errors) == [str(tmp_path / 'data99.txt')]
+    assert len(dp.cache) == n
+    
+    async def collect(pool):
+        return [(name, len(df)) async for name, df in pool.aiter_frames(concurrency=8, columns=['a'])]
+    
+    dp = DataPool(tmp_path, interface=SlowTextObject, lazy=True, cache_bytes=2**20)
+    t0 = time.perf_counter()
+    out = asyncio.run(collect(dp))
+    assert time.perf_counter() - t0 < sequential / 3
+    assert sorted(out) == [(f'data{i:02d}', 5) for i in range(n)]
+    assert len(dp.errors) == 1 and len(dp.cache) == 0
+
+#%%
+def test_textobject_rows_blank_lines(tmp_path):
+    
+    from djsurfer.lib_interface.text_object import TextObject
+    
+    path = tmp_path / 'crlf.txt'
+    lines = ['a,b'] + [f'{i},{i * 10}' for i in range(10)]
+    lines.insert(4, '')
+    lines.insert(8, ' ')
+    path.write_bytes(('\r\n'.join(lines) + '\r\n\r\n\r\n').encode())
+    
+    ref = TextObject(path).get_df()
+    assert len(ref) == 10
+    
+    for rows in [slice(-5, None), slice(2, 7), slice(8, 20), slice(12, 15), slice(-3, -1)]:
+        for engine in ['c', 'mmap']:
+            df = TextObject(path, engine=engine).get_df(rows=rows)
+            expected = ref.iloc[rows]
+            assert list(df.index) == list(expected.index), (engine, rows)
+            np.testing.assert_allclose(df.to_numpy(dtype=float), expected.to_numpy(dtype=float))
+
+#%%
+def test_datapool_get_signal_missing_time_base(tmp_path):
+    
+    from djsurfer.datapool import DataPool
+    from djsurfer.lib_interface.text_object import TextObject
+    
+    pd.DataFrame({'time': [0.5, 1.5], 'p': [1.0, 2.0]}).to_csv(tmp_path / 'a.txt', index=False)
+    pd.DataFrame({'p': [3.0, 4.0, 5.0]}).to_csv(tmp_path / 'b.txt', index=False)
+    pd.DataFrame({'time': [2.5], 'q': [6.0]}).to_csv(tmp_path / 'c.txt', index=False)
+    
+    dp = DataPool(tmp_path, interface=TextObject)
+    
+    # the row numbers of b.txt must not show up on the time axis
+    out = dp.get_signal('p', time_base='time')
+    assert list(out.columns) == ['a', 'b', 'c']
+    assert out.index.tolist() == [0.5, 1.5, 2.5]
+    assert out['a'].iloc[:2].tolist() == [1.0, 2.0] and np.isnan(out['a'].iloc[2])
+    assert out['b'].isna().all() and out['c'].isna().all()
+    
+    out = dp.get_signal('p', time_base='time', grid=[0.5, 1.5])
+    assert out['a'].tolist() == [1.0, 2.0] and out['b'].isna().all() and out['c'].isna().all()
+
+#%%
+def test_textobject_mmap_rows_past_end(tmp_path):
+    
+    import tracemalloc
+    from djsurfer.lib_interface.text_object import TextObject
+    
+    path = tmp_path / 'small.txt'
+    path.write_text('a,b\n1,10\n2,20\n\n3,30\n')
+    
+    # the output is sized by the rows in the file, not by the stop of the window
+    tracemalloc.start()
+    df = TextObject(path, engine='mmap').get_df(rows=slice(0, 10**8))
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    
+    assert peak < 2**20
+    assert df['b'].tolist() == [10.0, 20.0, 30.0]
+    assert list(df.index) == [0, 1, 2]
+    
+    df = TextObject(path, engine='mmap').get_df(rows=slice(2, 10**8))
+    assert df['a'].tolist() == [3.0] and list(df.index) == [2]
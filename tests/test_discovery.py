@@ -0,0 +1,45 @@
+#!/usr/bin/env python
+
+"""Tests for the file discovery of `djsurfer` datapools."""
+import os
+
+from djsurfer.discovery import scan_files, FileIndex
+
+#%%
+def make_tree(root):
+
+    (root / 'a' / 'b').mkdir(parents=True)
+    for path in ['x.txt', 'a/Kr_1.txt', 'a/b/Kr_2.txt', 'a/b/y.zip']:
+        (root / path).write_text('0')
+
+#%%
+def test_scan_files_filters(tmp_path):
+
+    make_tree(tmp_path)
+
+    assert len(scan_files(tmp_path)) == 4
+    assert [os.path.basename(p) for p in scan_files(tmp_path, ftype='.txt', glob='Kr_*')] == ['Kr_1.txt', 'Kr_2.txt']
+    assert [os.path.basename(p) for p in scan_files(tmp_path, pattern=r'\.zip$')] == ['y.zip']
+
+#%%
+def test_fileindex_incremental(tmp_path):
+
+    root = tmp_path / 'data'
+    root.mkdir()
+    make_tree(root)
+    index_file = str(tmp_path / 'index.json')
+
+    assert len(scan_files(root, index=FileIndex(index_file))) == 4
+
+    index = FileIndex(index_file)
+    scanned = []
+    scan = index._scan
+    index._scan = lambda *args: scanned.append(args[0]) or scan(*args)
+
+    (root / 'a' / 'b' / 'Kr_3.txt').write_text('0')
+    st = os.stat(root / 'a' / 'b')
+    os.utime(root / 'a' / 'b', ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+
+    assert len(scan_files(root, index=index)) == 5
+    assert scanned == [str(root / 'a' / 'b')]
+    assert str(root / 'a' / 'b' / 'Kr_3.txt') in index.files(root / 'a')
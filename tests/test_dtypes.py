@@ -0,0 +1,78 @@
+#!/usr/bin/env python
+
+"""Tests for the compact dtype policies of `djsurfer`."""
+import numpy as np
+import pandas as pd
+import pytest
+
+from djsurfer.dtypes import apply_dtype_policy, memory_report
+
+#%%
+def test_apply_dtype_policy():
+
+    df = pd.DataFrame({'exact': [0.5, 1.25, np.nan, 4.0], 'lossy': [0.1, 0.2, 0.3, 0.4], 
+                       'small': [1, 2, 3, 200], 'label': ['a', 'b', 'a', 'a'], 'unique': ['w', 'x', 'y', 'z']})
+
+    out = apply_dtype_policy(df, 'downcast')
+    assert out.dtypes.astype(str).tolist()[:3] == ['float32', 'float64', 'int16']
+    pd.testing.assert_frame_equal(out.astype(df.dtypes), df)
+
+    out = apply_dtype_policy(df, ['float32', 'categorical'])
+    assert out.dtypes.astype(str).tolist() == ['float32', 'float32', 'int64', 'category', df['unique'].dtype.name]
+
+    assert apply_dtype_policy(df, None) is df
+    with pytest.raises(ValueError):
+        apply_dtype_policy(df, 'float16')
+
+    report = memory_report(out)
+    assert report.index[0] == 'Index' and report.loc['exact', 'nbytes'] == 16
+    assert report['share'].sum() == pytest.approx(1.0)
+
+#%%
+def test_datapool_dtype_policy(tmp_path):
+
+    from djsurfer.datapool import DataPool
+    from djsurfer.lib_interface.text_object import TextObject
+
+    pd.DataFrame({'a': np.random.rand(100), 'b': np.arange(100.0)}).to_csv(tmp_path / 'data0.txt', index=False)
+    pd.DataFrame({'a': np.random.rand(50)}).to_csv(tmp_path / 'data1.txt', index=False)
+
+    dp = DataPool(tmp_path, interface=TextObject, cache_bytes=2**20, dtype_policy='float32')
+    assert (dp.objs[0].dataframe.dtypes == np.float32).all()
+    assert (dp.get_signal('b').dtypes == np.float32).all()
+    assert (dp.get_signal('a', freq=10).dtypes == np.float32).all()
+
+    long = dp.get_signals(['a', 'b'], how='long')
+    assert long['value'].dtype == np.float32
+
+    mm = DataPool(tmp_path, interface=TextObject, cache_bytes=2**20, dtype_policy='float32')
+    for obj in mm.objs:
+        obj.engine = 'mmap'
+    assert mm.objs[0].get_df().dtypes.tolist() == [np.float32, np.float32]
+
+    report = dp.memory_report()
+    assert report.loc['data0', 'dtypes'] == 'float32:2'
+    assert report.loc['data0', 'nbytes'] < 100 * 2 * 8
+    assert np.isnan(report.loc['data1', 'rows'])
+
+#%%
+def test_refresh_with_dtype_policy(tmp_path):
+
+    from djsurfer.cache import FrameCache
+    from djsurfer.lib_interface.text_object import TextObject
+
+    path = tmp_path / 'data.txt'
+    pd.DataFrame({'a': [1.5, 2.5]}).to_csv(path, index=False)
+
+    obj = TextObject(path)
+    obj.cache = FrameCache()
+    obj.dtype_policy = 'float32'
+    df = obj.dataframe
+    assert df['a'].dtype == np.float32
+
+    obj.invalidate()
+    assert len(obj.cache) == 0
+
+    refreshed = obj.refresh()
+    assert refreshed is not df and refreshed['a'].dtype == np.float32
+    assert len(obj.cache) == 1
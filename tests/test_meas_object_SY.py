@@ -0,0 +1,135 @@
+#!/usr/bin/env python
+
+"""Tests for the cylinder measure data interfaces of `djsurfer`."""
+import numpy as np
+import pytest
+
+from djsurfer.lib_interface.meas_object_SY import MeasTextObject_SY
+
+#%%
+def write_profile(path, n=380, z=65.0, radius=22.0, decimal_comma=False):
+
+    angle = np.deg2rad(np.arange(n) * 380 / n)
+    lines = [f'{radius * np.cos(a):.5f} {radius * np.sin(a):.5f} -{z:.3f}' for a in angle]
+    text = '\n'.join(lines) + '\n'
+    path.write_text(text.replace('.', ',') if decimal_comma else text)
+
+    return path
+
+@pytest.fixture
+def dir_meas(tmp_path):
+
+    leaf = tmp_path / 'run1'
+    leaf.mkdir()
+    for z in (65, 66):
+        write_profile(leaf / f'Kr_44H7FR_Z{z}.txt', z=z, decimal_comma=(z == 66))
+
+    return tmp_path
+
+#%%
+def test_meastextobject(dir_meas):
+
+    obj = MeasTextObject_SY(dir_meas / 'run1' / 'Kr_44H7FR_Z66.txt')
+    df = obj.get_df()
+
+    assert (obj.model_type, obj.meas_type, obj.radius_norm) == ('FDR', 'FR', 22.0)
+    assert df.columns.names == ['data_dir', 'model_type', 'meas_type', 'Z', 'data']
+    assert df.columns.get_level_values('Z').unique().tolist() == [66.0]
+    assert df.shape == (380, 3)
+
+    angle = df.xs('angle', level='data', axis=1).iloc[:, 0]
+    assert angle.iloc[90] == 90 and angle.iloc[360] == 360
+    np.testing.assert_allclose(df.xs('radius', level='data', axis=1), 22.0, atol=1e-4)
+
+#%%
+def test_measobject_incremental_merge(dir_meas):
+
+    from djsurfer.lib_interface.meas_object_SY import MeasObject_SY
+
+    obj = MeasObject_SY(dir_meas, config={})
+    df = obj.dataframe
+
+    assert df.shape == (380, 6)
+    assert obj.dataframe is df
+
+    write_profile(dir_meas / 'run1' / 'Kr_44H7FR_Z67.txt', z=67)
+    df = obj.dataframe
+    assert df.shape == (380, 9)
+    assert obj.dataframe is df
+
+    (dir_meas / 'run1' / 'Kr_44H7FR_Z65.txt').unlink()
+    assert sorted(obj.dataframe.columns.get_level_values('Z').unique()) == [66.0, 67.0]
+
+#%%
+def test_measobject_plot_data(dir_meas):
+
+    pytest.importorskip('matplotlib')
+    from djsurfer.lib_interface.meas_object_SY import MeasObject_SY
+
+    obj = MeasObject_SY(dir_meas, config={})
+    obj.plot_data(type_req='FR', z_req=(65, 66), show=False)
+
+    assert [p.name for p in (dir_meas / '_out').iterdir()] == ['run1_FR_65.0_66.0.png']
+
+#%%
+@pytest.mark.parametrize('jobs', [1, 2])
+def test_measobject_render_all(dir_meas, jobs):
+
+    pytest.importorskip('matplotlib')
+    from djsurfer.lib_interface.meas_object_SY import MeasObject_SY
+
+    obj = MeasObject_SY(dir_meas, config={})
+    outp_path = dir_meas / 'plots'
+
+    status = obj.render_all(outp_path=outp_path, jobs=jobs)
+    assert list(status.values()) == ['rendered']
+    assert (outp_path / 'run1_FR_65.0_66.0.png').is_file()
+
+    status = obj.render_all(outp_path=outp_path, jobs=jobs)
+    assert list(status.values()) == ['skipped']
+
+    status = obj.render_all(outp_path=outp_path, jobs=jobs, color='red')
+    assert list(status.values()) == ['rendered']
+
+#%%
+def test_meastextobject_iter_chunks(dir_meas):
+
+    import pandas as pd
+
+    obj = MeasTextObject_SY(dir_meas / 'run1' / 'Kr_44H7FR_Z66.txt')
+    chunks = list(obj.iter_chunks(chunksize=100))
+
+    assert [len(chunk) for chunk in chunks] == [100, 100, 100, 80]
+    pd.testing.assert_frame_equal(pd.concat(chunks), obj.get_df())
+
+#%%
+def test_measobject_render_all_failures(dir_meas, monkeypatch):
+
+    pytest.importorskip('matplotlib')
+    import json
+    from djsurfer.lib_interface.meas_object_SY import MeasObject_SY
+
+    leaf = dir_meas / 'run2'
+    leaf.mkdir()
+    write_profile(leaf / 'Kr_44H7FR_Z65.txt', z=65)
+
+    obj = MeasObject_SY(dir_meas, config={})
+    outp_path = dir_meas / 'plots'
+    assert obj.render_all(outp_path=outp_path, jobs=1, types=['DR']) == {}
+
+    render = MeasObject_SY.plot_data_set
+    def plot_data_set(outp_path, df_plot, color, show):
+        if 'run1' in df_plot.columns.get_level_values('data_dir'):
+            raise RuntimeError('broken')
+        return render(outp_path, df_plot, color, show)
+    monkeypatch.setattr(MeasObject_SY, 'plot_data_set', staticmethod(plot_data_set))
+
+    status = obj.render_all(outp_path=outp_path, jobs=1)
+    assert sorted(status.values()) == ['failed', 'rendered']
+    assert list(obj.render_errors) == [str(outp_path / 'run1_FR_65.0_66.0.png')]
+    with open(outp_path / '_render_manifest.json') as f:
+        assert list(json.load(f)) == ['run2_FR_65.0.png']
+
+    monkeypatch.undo()
+    status = obj.render_all(outp_path=outp_path, jobs=1)
+    assert status == {str(outp_path / 'run1_FR_65.0_66.0.png'): 'rendered', str(outp_path / 'run2_FR_65.0.png'): 'skipped'}
@@ -0,0 +1,77 @@
+#!/usr/bin/env python
+
+"""Tests for the profiling hooks of `djsurfer`."""
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from djsurfer.profiling import profile, add_hook, remove_hook, span
+
+#%%
+def test_profile_datapool(tmp_path):
+
+    from djsurfer.datapool import DataPool
+    from djsurfer.lib_interface.text_object import TextObject
+
+    for i in range(3):
+        pd.DataFrame(np.random.rand(50, 2), columns=['a', 'b']).to_csv(tmp_path / f'data{i}.txt', index=False)
+    (tmp_path / 'data3.txt').write_text('a,b\n1,2,3,4\n"')
+
+    with profile(track_memory=True) as prof:
+        dp = DataPool(tmp_path, interface=TextObject, ftype='.txt', cache_bytes=2**20)
+        dp.load(workers=2)
+        with pytest.raises(pd.errors.ParserError):
+            dp.get_signal('a')
+
+    table = prof.table()
+    assert list(table['stage'].unique()) == ['discover', 'parse', 'load', 'get_signal']
+
+    parse = table[table['stage'] == 'parse'].set_index('name')
+    assert sorted(parse.index) == ['data0', 'data1', 'data2', 'data3', 'data3']
+    assert parse.loc['data0', 'rows'] == 50 and parse.loc['data0', 'cols'] == 2
+    assert parse.loc['data0', 'nbytes'] == (tmp_path / 'data0.txt').stat().st_size
+    assert parse.loc['data0', 'peak_bytes'] > 0
+    assert parse.loc['data3', 'error'].str.startswith('ParserError').all()
+
+    summary = prof.summary()
+    assert summary.loc['parse', 'count'] == 5 and summary.loc['parse', 'errors'] == 2
+    assert summary.loc['get_signal', 'errors'] == 1
+    assert len(prof.slowest(2)) == 2
+
+    prof.save_trace(tmp_path / 'trace.json')
+    with open(tmp_path / 'trace.json') as f:
+        trace = json.load(f)
+    assert len(trace['traceEvents']) == len(table)
+
+#%%
+def test_hooks():
+
+    events = []
+    add_hook(events.append)
+    try:
+        with span('stage', 'name') as info:
+            info['frame'] = pd.DataFrame(np.zeros((3, 2)))
+    finally:
+        remove_hook(events.append)
+
+    with span('stage', 'other'):
+        pass
+
+    assert [(e.stage, e.name, e.rows, e.cols, e.peak_bytes) for e in events] == [('stage', 'name', 3, 2, None)]
+
+#%%
+def test_profile_without_reset_peak(monkeypatch):
+
+    import tracemalloc
+    from djsurfer import profiling
+
+    # Python < 3.9 has no tracemalloc.reset_peak, peaks are not recorded then
+    monkeypatch.setattr(profiling, '_PEAKS', False)
+    with profile(track_memory=True) as prof:
+        assert not tracemalloc.is_tracing()
+        with span('stage'):
+            pass
+
+    assert [e.peak_bytes for e in prof.events] == [None]
@@ -0,0 +1,61 @@
+#!/usr/bin/env python
+
+"""Tests for the interface registry of `djsurfer`."""
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from djsurfer.registry import Registry, default_registry
+from djsurfer.lib_interface.text_object import TextObject
+from djsurfer.lib_interface.d97_object import D97_Object
+from djsurfer.lib_interface.meas_object_SY import MeasTextObject_SY
+from djsurfer.lib_interface.get_data_textreport import TextReportObject
+from djsurfer.lib_interface.unit_splitt_from_textobject import split_unit_from_textobject
+
+#%%
+def test_default_registry_mixed_pool(tmp_path):
+
+    from djsurfer.datapool import DataPool
+
+    pd.DataFrame(np.random.rand(10, 2), columns=['a', 'b']).to_csv(tmp_path / 'data.txt', index=False)
+    (tmp_path / 'Kr_44H7FR_Z65.txt').write_text('22.0 0.0 -65.0\n0.0 22.0 -65.0\n')
+    # single-unit files as written by the splitter, without the 'Test Results Report' marker
+    log = tmp_path / 'logs' / 'log.txt'
+    log.parent.mkdir()
+    log.write_text('header\n' + ' ==========\n'.join(
+        f'Test Results Report\nFile Name:   unit{i}\nReport Date:  May 1, 2024    Time:  10:22:33\nFailures:   {i}\n'
+        for i in (1, 2)))
+    split_unit_from_textobject(log, tmp_path)
+    log.unlink()
+    (tmp_path / 'run.ZIP').write_bytes(b'PK')
+    (tmp_path / 'notes.md').write_text('# notes')
+
+    dp = DataPool(tmp_path, interface=default_registry(), lazy=True)
+
+    assert {Path(p).name: cls for p, cls in dp.interfaces.items()} == {
+        'Kr_44H7FR_Z65.txt': MeasTextObject_SY, 'data.txt': TextObject,
+        'run.ZIP': D97_Object, 'log_split_1.txt': TextReportObject, 'log_split_2.txt': TextReportObject}
+    assert len(dp.files) == 5
+    assert 'Test Results Report' not in (tmp_path / 'log_split_1.txt').read_text()
+
+    # only the objects of the requested interface are created, d97parser is not needed
+    assert [obj.name for obj in dp.of_type(TextObject)] == ['data']
+    assert [obj.get_record()['Filename'] for obj in dp.of_type(TextReportObject)] == ['unit1', 'unit2']
+
+#%%
+def test_registry_priority_and_sniff(tmp_path):
+
+    class Special(TextObject):
+        pass
+
+    registry = Registry()
+    registry.register(TextObject, ftype='.csv')
+    registry.register(Special, ftype='.csv', sniff=lambda head: head.startswith(b'special'), priority=1)
+
+    (tmp_path / 'a.csv').write_text('special,x\n1,2\n')
+    (tmp_path / 'b.csv').write_text('a,b\n1,2\n')
+
+    assert registry.resolve(tmp_path / 'a.csv') is Special
+    assert registry.resolve(tmp_path / 'b.csv') is TextObject
+    assert registry.resolve(tmp_path / 'c.txt') is None
@@ -0,0 +1,19 @@
+#!/usr/bin/env python
+
+"""Tests for the signal alignment of `djsurfer`."""
+import numpy as np
+
+from djsurfer.resample import merge_ffill
+
+#%%
+def test_merge_ffill():
+
+    signals = {
+        'fast': ([0.0, 0.1, 0.2, 0.3], [1.0, 2.0, 3.0, 4.0]),
+        'slow': ([0.15, 0.3], [10.0, 20.0]),
+    }
+    time, merged = merge_ffill(signals)
+
+    np.testing.assert_allclose(time, [0.0, 0.1, 0.15, 0.2, 0.3])
+    np.testing.assert_allclose(merged['fast'], [1, 2, 2, 3, 4])
+    np.testing.assert_allclose(merged['slow'], [10, 10, 10, 10, 20])
@@ -0,0 +1,132 @@
+#!/usr/bin/env python
+
+"""Tests for the ICT text report interface of `djsurfer`."""
+import pytest
+
+from djsurfer.lib_interface.get_data_textreport import TextReportObject, Field, DEFAULT_FIELDS
+
+#%%
+REPORT = """Test Results Report
+File Name:   {name}
+Report Date:  May 1, 2024    Time:  10:22:33
+Failures:   {failures}
+NTC1   10.00K   1.00K   10.05K
+NTC2   10.00K   1.00K   9.95K
+NTC3   10.00K   1.00K   10.20K
+C1   100.00p   5.00p   101.20pF
+C2   100.00p   5.00p   99.80pF
+5-51_Op   100.00M   > 10 M   > 100 M
+6-52_Op   100.00M   > 10 M   > 100 M
+"""
+
+@pytest.fixture
+def report_file(tmp_path):
+
+    path = tmp_path / 'unit_split_1.txt'
+    path.write_text(REPORT.format(name='217312-0128-15_CELL', failures=2))
+
+    return path
+
+#%%
+def test_textreportobject(report_file):
+
+    df = TextReportObject(report_file).get_df()
+
+    assert df.shape == (1, 10)
+    assert df.loc[0, 'Filename'] == '217312-0128-15_CELL'
+    assert df.loc[0, 'NTC2_measured [KOhm]'] == 9.95
+    assert df.loc[0, 'IsoRes1_measured [MOhm]'] == '> 100 '
+    assert df.loc[0, 'Failure'] == 2
+
+#%%
+def test_textreportobject_custom_fields(report_file):
+
+    fields = list(DEFAULT_FIELDS) + [Field('NTC3_measured [KOhm]', r'NTC3\s+\d+\.\d+K\s+\d+\.\d+\w+\s+(\d+\.\d+)K', float),
+                                     ('Missing', r'Missing:\s+(\d+)', int)]
+    df = TextReportObject(report_file, fields=fields).get_df(columns=['Failure', 'NTC3_measured [KOhm]', 'Missing'])
+
+    assert list(df.columns) == ['Failure', 'NTC3_measured [KOhm]', 'Missing']
+    assert df.loc[0, 'NTC3_measured [KOhm]'] == 10.2
+    assert df['Missing'].isna().all()
+
+#%%
+def test_split_units_streaming(tmp_path):
+
+    from djsurfer.lib_interface.unit_splitt_from_textobject import (iter_units, iter_unit_records,
+                                                                    write_unit_table, split_unit_from_textobject)
+
+    log = tmp_path / 'CELL_Testfile.txt'
+    text = 'header\n' + ' ==========\n'.join(REPORT.format(name=f'unit{i}', failures=i) for i in range(3))
+    log.write_text(text + 'Test Results Report\n\n')
+
+    units = list(iter_units(log))
+    assert len(units) == 4 and units[-1] == ''
+    assert units[1].splitlines()[0] == 'File Name:   unit1'
+    assert all('===' not in unit for unit in units)
+
+    records = list(iter_unit_records(log))
+    assert [r['Filename'] for r in records] == ['unit0', 'unit1', 'unit2']
+    assert [r['Failure'] for r in records] == [0, 1, 2]
+
+    assert write_unit_table(log, tmp_path / 'units.csv') == 3
+    assert (tmp_path / 'units.csv').read_text().splitlines()[0].startswith('Filename,Date,Time')
+
+    out = tmp_path / 'split'
+    out.mkdir()
+    split_unit_from_textobject(log, out)
+    assert sorted(p.name for p in out.iterdir()) == [f'CELL_Testfile_split_{i}.txt' for i in (1, 2, 3)]
+    assert (out / 'CELL_Testfile_split_2.txt').read_text() == units[1]
+
+#%%
+@pytest.mark.parametrize('workers', [None, 2])
+def test_datapool_to_table(tmp_path, workers):
+
+    from djsurfer.datapool import DataPool
+
+    for i in range(3):
+        (tmp_path / f'unit_{i}.txt').write_text(REPORT.format(name=f'unit{i}', failures=i))
+    (tmp_path / 'unit_3.txt').write_text('File Name:   unit3\n')
+
+    dp = DataPool(tmp_path, interface=TextReportObject, ftype='.txt')
+    table = dp.to_table(workers=workers)
+
+    assert table.shape == (4, 11)
+    assert list(table['file']) == [f'unit_{i}' for i in range(4)]
+    assert table['NTC1_measured [KOhm]'].dtype == float
+    assert table['Failure'].isna().sum() == 1
+    assert table.loc[3, 'Filename'] == 'unit3'
+
+#%%
+def test_datapool_to_table_compact(tmp_path):
+
+    from djsurfer.datapool import DataPool
+
+    for i in range(4):
+        (tmp_path / f'unit_{i}.txt').write_text(REPORT.format(name=f'unit{i}', failures=i % 2))
+
+    dp = DataPool(tmp_path, interface=TextReportObject, ftype='.txt', dtype_policy=['downcast', 'categorical'])
+    table = dp.to_table()
+
+    assert table['Date'].dtype == 'category'
+    assert table['Filename'].dtype != 'category'
+    assert table['Failure'].dtype == 'int8'
+
+#%%
+@pytest.mark.parametrize('content', [
+    REPORT.format(name='217312-0128-15_CELL', failures=2),
+    REPORT.format(name='', failures=2),
+    REPORT.format(name='unit1', failures='').replace('NTC1   10.00K   1.00K   10.05K', 'NTC1'),
+    'File Name:\nReport Date:  May 1, 2024    Time:\n10:22:33\nC1   100.00p   5.00p   101.20pF\n',
+])
+def test_extract_fields_parity(content):
+
+    import re
+    from djsurfer.lib_interface.get_data_textreport import extract_fields
+
+    # the former implementation: one search per field
+    expected = {}
+    for name, pattern, converter in DEFAULT_FIELDS:
+        match = re.search(pattern, content)
+        expected[name] = converter(match.group(1)) if match else None
+
+    assert extract_fields(content) == expected